@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Citation Enrichment for Content Reports
+Fetches titles, publishers and publish dates for citation URLs with bounded
+concurrency, and keeps a persistent metadata cache so repeated sources are
+only fetched once across topics and runs
+"""
+
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+import requests
+from bs4 import BeautifulSoup
+
+# Metadata lives in <head>, so there is no need to download whole articles
+MAX_HTML_BYTES = 512 * 1024
+
+PUBLISHED_META_KEYS = [
+    'article:published_time',
+    'og:published_time',
+    'datePublished',
+    'pubdate',
+    'publish-date',
+    'date',
+    'dc.date',
+    'sailthru.date'
+]
+
+
+def parse_metadata(html: Union[str, bytes], url: str, encoding: Optional[str] = None) -> Dict[str, Optional[str]]:
+    """Extract title, publisher and publish date from an HTML page
+
+    Raw bytes without an encoding let BeautifulSoup honour the page's <meta charset>.
+    """
+    soup = BeautifulSoup(html, 'html.parser', from_encoding=encoding if isinstance(html, bytes) else None)
+
+    def meta(*keys: str) -> Optional[str]:
+        for key in keys:
+            tag = (soup.find('meta', attrs={'property': key}) or
+                   soup.find('meta', attrs={'name': key}) or
+                   soup.find('meta', attrs={'itemprop': key}))
+            if tag and tag.get('content'):
+                return tag['content'].strip()
+        return None
+
+    title = meta('og:title', 'twitter:title')
+    if not title and soup.title and soup.title.string:
+        title = soup.title.string.strip()
+
+    published = meta(*PUBLISHED_META_KEYS)
+    if not published:
+        time_tag = soup.find('time', attrs={'datetime': True})
+        if time_tag:
+            published = time_tag['datetime'].strip()
+
+    return {
+        'title': title,
+        'publisher': meta('og:site_name', 'application-name', 'publisher') or urlparse(url).netloc,
+        'published': published
+    }
+
+
+class CitationEnricher:
+    def __init__(self, cache_file: str = "data/citation_cache.json", ttl_hours: float = 168,
+                 concurrency: int = 8, timeout: float = 10.0, failure_ttl_hours: float = 24):
+        self.cache_file = cache_file
+        self.ttl_seconds = ttl_hours * 3600
+        self.failure_ttl_seconds = failure_ttl_hours * 3600
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.cache = self.load_cache()
+        self.stats = {'cache_hits': 0, 'fetched': 0, 'failed': 0, 'cached_failures': 0}
+
+    def load_cache(self) -> Dict[str, Dict[str, Any]]:
+        """Load cached URL metadata from disk"""
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def save_cache(self):
+        """Write the cache atomically so concurrent runs never see a partial file"""
+        os.makedirs(os.path.dirname(self.cache_file) or '.', exist_ok=True)
+        tmp_file = f"{self.cache_file}.{os.getpid()}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.cache, f, indent=2)
+        os.replace(tmp_file, self.cache_file)
+
+    def get_cached(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return cached metadata or a cached failure if it is still within its TTL"""
+        entry = self.cache.get(url)
+        if not entry:
+            return None
+        # Failures expire sooner so a source that was only briefly down is retried
+        ttl_seconds = self.failure_ttl_seconds if entry.get('error') else self.ttl_seconds
+        if time.time() - entry.get('fetched_at', 0) < ttl_seconds:
+            return entry
+        return None
+
+    def fetch_metadata(self, url: str, timeout: float) -> Dict[str, Any]:
+        """Download the start of a page and parse its metadata"""
+        with requests.get(url, timeout=timeout, stream=True,
+                          headers={'User-Agent': 'TrendForge citation enricher'}) as response:
+            response.raise_for_status()
+            body = b""
+            for chunk in response.iter_content(chunk_size=16384):
+                body += chunk
+                if len(body) >= MAX_HTML_BYTES:
+                    break
+            # requests falls back to ISO-8859-1 for text/html without a charset; only trust an explicit one
+            content_type = response.headers.get('Content-Type', '')
+            encoding = response.encoding if 'charset' in content_type.lower() else None
+
+        metadata = parse_metadata(body, url, encoding)
+        metadata['fetched_at'] = time.time()
+        return metadata
+
+    async def _enrich_async(self, urls: List[str], timeout: float) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        """Fetch URLs concurrently and return (metadata, failures) keyed by URL"""
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        results = {}
+        failures = {}
+
+        async def enrich_one(url: str, executor: ThreadPoolExecutor):
+            async with semaphore:
+                try:
+                    results[url] = await loop.run_in_executor(executor, self.fetch_metadata, url, timeout)
+                    self.stats['fetched'] += 1
+                except Exception as e:
+                    print(f"⚠️ Could not fetch citation metadata for {url}: {e}")
+                    self.stats['failed'] += 1
+                    # Remember the failure so sources that block bots are not waited on every run
+                    failures[url] = {'error': str(e), 'fetched_at': time.time()}
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            await asyncio.gather(*(enrich_one(url, executor) for url in urls))
+        return results, failures
+
+    def enrich(self, urls: List[str], timeout: Optional[float] = None, offline: bool = False) -> Dict[str, Dict[str, Any]]:
+        """Return metadata for every URL that could be resolved, fetching only cache misses (none when offline)"""
+        metadata = {}
+        to_fetch = []
+        for url in dict.fromkeys(urls):  # De-duplicate while keeping order
+            cached = self.get_cached(url)
+            if cached and cached.get('error'):
+                self.stats['cached_failures'] += 1
+            elif cached:
+                metadata[url] = cached
+                self.stats['cache_hits'] += 1
+            elif not offline and url.startswith(('http://', 'https://')):
+                to_fetch.append(url)
+
+        if to_fetch:
+            print(f"🔗 Resolving {len(to_fetch)} citations ({len(metadata)} cached)...")
+            fetched, failures = asyncio.run(self._enrich_async(to_fetch, timeout or self.timeout))
+            self.cache.update(failures)
+            self.cache.update(fetched)
+            metadata.update(fetched)
+            self.save_cache()
+
+        return metadata
@@ -12,71 +12,214 @@ import os
 import requests
 import json
 import base64
+import html
 import random
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple, Iterable
 from dotenv import load_dotenv
 from openai import OpenAI
+from openai.types import ImagesResponse
+from openai.types.chat import ChatCompletion
 import time
 from topic_selector import TopicSelector
+from run_budget import RunBudget, CircuitBreaker
+from prompts import build_research_messages, build_post_messages, build_variant_messages
+from result_export import ResultExporter
+from citation_enricher import CitationEnricher
+from image_pool import ImagePool, start_background_refill
+from coverage_store import CoverageStore
+from post_quality_gate import PostQualityGate
+from topic_sources import open_topic_source, stream_topics
+from image_quality import ImageTierPolicy, RerenderQueue, AUTO_TIER
+from topic_yield import TopicYieldStore, TopicScheduler
+from transport import Transport
 
 # Load environment variables
 load_dotenv()
 
+# Streaming runs only list this many skipped steps in detail and count the rest
+MAX_SKIP_DETAILS = 200
+
 class ContentAutomation:
-    def __init__(self, config_file: str = "topics.json"):
+    def __init__(self, config_file: str = "topics.json", transport: Optional[Transport] = None):
         self.perplexity_api_key = os.getenv('PERPLEXITY_API_KEY')
         self.openai_api_key = os.getenv('OPENAI_API_KEY')
         
-        if not self.perplexity_api_key:
+        # Live, recording or replaying transport for every research, post and image call
+        self.transport = transport or Transport()
+        
+        # Replays never reach the providers, so they need no API keys
+        if not self.perplexity_api_key and not self.transport.offline:
             raise ValueError("PERPLEXITY_API_KEY not found in .env file")
-        if not self.openai_api_key:
+        if not self.openai_api_key and not self.transport.offline:
             raise ValueError("OPENAI_API_KEY not found in .env file")
             
-        self.openai_client = OpenAI(api_key=self.openai_api_key)
+        self.openai_client = OpenAI(api_key=self.openai_api_key or "replay")
         self.perplexity_url = "https://api.perplexity.ai/chat/completions"
         
         # Load configuration
+        self.config_file = config_file
         self.topic_selector = TopicSelector(config_file)
         self.config = self.topic_selector.get_config()
         self.content_focus = self.config.get('content_focus', 'General Topics')
         self.topics = []  # Will be set during topic selection
+        self.topic_count = None  # Topics read from a streaming source, which are not kept in memory
+        
+        # Run deadline and per-provider circuit breakers
+        self.run_settings = self.config.get('run_settings', {})
+        self.budget = self.create_budget()
+        breaker_threshold = self.run_settings.get('breaker_failure_threshold', 3)
+        breaker_cooldown = self.run_settings.get('breaker_cooldown_seconds', 120)
+        self.breakers = {
+            name: CircuitBreaker(name, breaker_threshold, breaker_cooldown)
+            for name in ('perplexity', 'openai_chat', 'openai_images')
+        }
         
         self.scraped_data = []
         self.generated_posts = []
+        self.skipped_topics = []
+        self.skipped_overflow = 0  # Skipped steps beyond MAX_SKIP_DETAILS in streaming runs
+        self.usage_totals = {}
+        self.report_stem = None
+        
+        # Optional warm pool of pre-generated topic images
+        pool_settings = self.config.get('image_pool_settings', {})
+        self.image_pool = self.create_image_pool() if pool_settings.get('enabled', False) else None
+        
+        # Image quality tiers picked from the remaining run budget
+        self.image_settings = self.config.get('image_settings', {})
+        self.image_policy = ImageTierPolicy(self.image_settings.get('tiers'), self.image_settings.get('expected_seconds'))
+        self.images_remaining = 1  # Posts still waiting for an image, set by the run loop
+        
+        # Per-topic yield history, used to order topics by expected value
+        self.priority_settings = self.config.get('priority_settings', {})
+        self.topic_scheduler = self.create_topic_scheduler() if self.priority_settings.get('track_yield', True) else None
+        
+        # Fingerprints of previously published stories
+        self.coverage_settings = self.config.get('coverage_settings', {})
+        self.coverage_store = (CoverageStore(self.coverage_settings.get('db_file', 'data/coverage.db'))
+                               if self.coverage_settings.get('enabled', True) else None)
+        
+        if self.transport.offline:
+            # A replay must not depend on or change history, so it can be repeated with the same result
+            self.coverage_store = None
+            self.topic_scheduler = None
+            self.image_pool = None
+            self.image_settings = {**self.image_settings, 'rerender_high_quality': False}
     
     def set_topics(self, topics: List[str]):
         """Set the topics to be processed"""
         self.topics = topics
     
+    def create_budget(self, deadline_minutes: Optional[float] = None) -> RunBudget:
+        """Create a run budget from run_settings, optionally overriding the deadline"""
+        if deadline_minutes is None:
+            deadline_minutes = self.run_settings.get('deadline_minutes')
+        deadline_seconds = deadline_minutes * 60 if deadline_minutes else None
+        return RunBudget(deadline_seconds, self.run_settings.get('request_timeout_seconds', 120),
+                         sleep_scale=self.transport.timing_scale)
+    
+    def create_image_pool(self) -> ImagePool:
+        """Create the image pool from image_pool_settings"""
+        pool_settings = self.config.get('image_pool_settings', {})
+        return ImagePool(
+            pool_dir=pool_settings.get('pool_dir', 'images/pool'),
+            depth=pool_settings.get('depth', 2),
+            max_age_hours=pool_settings.get('max_age_hours', 72)
+        )
+    
+    def create_topic_scheduler(self) -> TopicScheduler:
+        """Create the topic yield store and scheduler from priority_settings"""
+        store = TopicYieldStore(self.priority_settings.get('db_file', 'data/topic_yield.db'))
+        return TopicScheduler(store, self.content_focus, self.priority_settings.get('min_pass_rate', 0.0))
+    
+    def prioritize_topics(self, topics: List[str], use_deadline: bool = True) -> List[str]:
+        """Order topics by expected yield and defer those the run budget cannot afford"""
+        remaining = self.budget.remaining() if use_deadline else None
+        time_budget = remaining * self.priority_settings.get('research_share', 0.5) if remaining is not None else None
+        scheduled, deferred = self.topic_scheduler.prioritize(
+            topics,
+            time_budget=time_budget,
+            token_budget=self.priority_settings.get('max_research_tokens'),
+            max_topics=self.priority_settings.get('max_topics')
+        )
+        
+        print(f"📈 Scheduled {len(scheduled)} topics by expected yield" +
+              (f", deferred {len(deferred)} low-yield topics" if deferred else ""))
+        for topic in deferred:
+            self.skipped_topics.append({'topic': topic, 'stage': 'scheduling',
+                                        'reason': "expected yield too low for this run's budget"})
+        return scheduled
+    
+    def record_topic_yield(self, scraped_data: List[Dict[str, Any]], passed_topics: List[Dict[str, Any]]):
+        """Add this run's quality filter outcomes, latency and token cost to the topic history"""
+        if not self.topic_scheduler:
+            return
+        
+        passed = {data['topic'] for data in passed_topics}
+        results = [
+            (data['topic'], data['topic'] in passed, data['timings']['research'],
+             data.get('usage', {}).get('prompt_tokens', 0) + data.get('usage', {}).get('completion_tokens', 0))
+            for data in scraped_data
+            if not data.get('skipped') and 'research' in data.get('timings', {})  # Only completed research calls
+        ]
+        if results:
+            self.topic_scheduler.store.record(self.content_focus, results)
+    
+    def create_rerender_queue(self) -> RerenderQueue:
+        """Create the top-tier re-render queue from image_settings"""
+        return RerenderQueue(self.image_settings.get('rerender_queue', 'data/image_rerenders.db'))
+    
+    def check_call_allowed(self, provider: str, topic: str, stage: str) -> Optional[str]:
+        """Return a skip reason if the deadline or circuit breaker blocks this call"""
+        if self.budget.expired():
+            reason = "run deadline reached"
+        elif not self.breakers[provider].allow():
+            reason = f"{provider} circuit breaker open"
+        else:
+            return None
+        
+        print(f"⏭️ Skipping {stage} for {topic}: {reason}")
+        self.skipped_topics.append({'topic': topic, 'stage': stage, 'reason': reason})
+        return reason
+    
+    def record_usage(self, provider: str, usage: Any) -> Dict[str, int]:
+        """Normalize token usage (including cached prompt tokens) and add it to the run totals"""
+        if usage is None:
+            usage = {}
+        elif not isinstance(usage, dict):
+            usage = usage.model_dump() if hasattr(usage, 'model_dump') else vars(usage)
+        
+        details = usage.get('prompt_tokens_details') or {}
+        summary = {
+            'prompt_tokens': usage.get('prompt_tokens') or 0,
+            'completion_tokens': usage.get('completion_tokens') or 0,
+            'cached_tokens': details.get('cached_tokens') or usage.get('cached_tokens') or 0
+        }
+        
+        totals = self.usage_totals.setdefault(provider, {key: 0 for key in summary})
+        for key, value in summary.items():
+            totals[key] += value
+        return summary
+    
     def scrape_latest_trends(self, topic: str) -> Dict[str, Any]:
         """Scrape latest trends for a specific topic using Perplexity API"""
         print(f"🔍 Researching latest trends in: {topic}")
         
+        skip_reason = self.check_call_allowed('perplexity', topic, 'research')
+        if skip_reason:
+            return {
+                'topic': topic,
+                'content': f"Skipped research for {topic}",
+                'citations': [],
+                'timestamp': datetime.now().isoformat(),
+                'skipped': skip_reason
+            }
+        
         # Get current date for recent content filtering
         current_date = datetime.now()
         last_month = current_date - timedelta(days=30)
         
-        prompt = f"""
-        Search for the LATEST news, trends, and developments in {topic} from the past 30 days only. 
-        Focus on:
-        - Recent announcements, breakthroughs, or innovations
-        - New research findings or studies
-        - Industry updates or changes
-        - Market analysis or reports
-        - Expert opinions and thought leadership
-        - Startup developments or funding news
-        
-        Please provide:
-        1. 3-5 most significant recent developments
-        2. Key statistics or data points
-        3. Notable companies, people, or organizations involved
-        4. Future implications or trends
-        
-        Only include information from {last_month.strftime('%B %Y')} onwards. Ignore older content.
-        Content focus area: {self.content_focus}
-        """
-        
         headers = {
             "Authorization": f"Bearer {self.perplexity_api_key}",
             "Content-Type": "application/json"
@@ -84,16 +227,7 @@ class ContentAutomation:
         
         payload = {
             "model": "sonar-pro",
-            "messages": [
-                {
-                    "role": "system",
-                    "content": f"You are an expert researcher focused on {self.content_focus}. Focus only on the most recent and credible information from the past month."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
+            "messages": build_research_messages(self.content_focus, last_month.strftime('%B %Y'), topic),
             "max_tokens": 1500,
             "temperature": 0.2,
             "top_p": 0.9,
@@ -101,23 +235,32 @@ class ContentAutomation:
             "search_domain_filter": ["techcrunch.com", "forbes.com", "wired.com", "reuters.com", "bloomberg.com"]
         }
         
-        try:
-            response = requests.post(self.perplexity_url, json=payload, headers=headers)
+        def send_research_request() -> Dict[str, Any]:
+            response = requests.post(self.perplexity_url, json=payload, headers=headers,
+                                     timeout=self.budget.timeout_for())
             response.raise_for_status()
-            
-            data = response.json()
+            return response.json()
+        
+        try:
+            started = time.monotonic()
+            data = self.transport.call('perplexity', payload, send_research_request)
             content = data['choices'][0]['message']['content']
             citations = data.get('citations', [])
+            self.breakers['perplexity'].record_success()
             
             return {
                 'topic': topic,
                 'content': content,
                 'citations': citations,
+                'usage': self.record_usage('perplexity', data.get('usage')),
+                'timings': {'research': round(time.monotonic() - started, 3)},
                 'timestamp': datetime.now().isoformat()
             }
             
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, ValueError, KeyError) as e:
+            # ValueError/KeyError cover a malformed or non-JSON response body
             print(f"❌ Error scraping {topic}: {e}")
+            self.breakers['perplexity'].record_failure()
             return {
                 'topic': topic,
                 'content': f"Error retrieving data for {topic}",
@@ -125,74 +268,295 @@ class ContentAutomation:
                 'timestamp': datetime.now().isoformat()
             }
     
+    def select_quality_topics(self, scraped_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Select top 5-8 most promising topics based on content quality"""
+        quality_topics = [data for data in scraped_data
+                          if not data.get('skipped') and len(data['content']) > 200 and 'Error' not in data['content']]
+        
+        quality_topics = self.check_coverage(quality_topics)
+        self.record_topic_yield(scraped_data, quality_topics)
+        # Stories that were partly covered before only get the slots nobody else needs
+        quality_topics.sort(key=lambda data: data.get('coverage', {}).get('decision') == 'downgrade')
+        return quality_topics[:self.run_settings.get('max_posts', 8)]  # Take top 8 topics by default
+    
+    def check_coverage(self, scraped_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Drop or downgrade research whose main developments were already published"""
+        if not self.coverage_store:
+            return scraped_data
+        
+        skip_threshold = self.coverage_settings.get('skip_threshold', 0.6)
+        downgrade_threshold = self.coverage_settings.get('downgrade_threshold', 0.3)
+        lookback_days = self.coverage_settings.get('lookback_days', 90)
+        
+        fresh_topics = []
+        for trend_data in scraped_data:
+            coverage = self.coverage_store.check(trend_data['content'], trend_data['citations'],
+                                                 self.content_focus, lookback_days)
+            if coverage['score'] >= skip_threshold:
+                coverage['decision'] = 'skip'
+            elif coverage['score'] >= downgrade_threshold:
+                coverage['decision'] = 'downgrade'
+                print(f"↘️ Downgrading {trend_data['topic']}: {coverage['score']:.0%} of research matches earlier posts")
+            else:
+                coverage['decision'] = 'new'
+            trend_data['coverage'] = coverage
+            
+            if coverage['decision'] == 'skip':
+                reason = f"already covered ({coverage['score']:.0%} of research matches earlier posts)"
+                print(f"⏭️ Skipping post for {trend_data['topic']}: {reason}")
+                self.skipped_topics.append({'topic': trend_data['topic'], 'stage': 'coverage', 'reason': reason})
+                continue
+            fresh_topics.append(trend_data)
+        
+        return fresh_topics
+    
+    def record_coverage(self, post_data: Dict[str, Any]):
+        """Remember a generated post's story so later runs can recognise it"""
+        if not self.coverage_store or post_data.get('skipped') or post_data.get('error'):
+            return
+        
+        texts = [post_data['post_content']] + [variant['post_content'] for variant in post_data.get('variants', [])[1:]]
+        self.coverage_store.record_story(post_data['topic'], self.content_focus, "\n".join(texts),
+                                         post_data.get('citations', []))
+    
     def generate_linkedin_post(self, trend_data: Dict[str, Any]) -> Dict[str, Any]:
         """Generate a LinkedIn post based on scraped trend data"""
         print(f"✍️ Generating LinkedIn post for: {trend_data['topic']}")
         
-        post_settings = self.config.get('post_settings', {})
-        word_count = post_settings.get('word_count_range', '300-500')
-        tone = post_settings.get('tone', 'professional but engaging')
-        include_hashtags = post_settings.get('include_hashtags', True)
-        include_questions = post_settings.get('include_questions', True)
-        
-        prompt = f"""
-        Based on this latest research about {trend_data['topic']}:
+        skip_reason = self.check_call_allowed('openai_chat', trend_data['topic'], 'post')
+        if skip_reason:
+            return {
+                'topic': trend_data['topic'],
+                'post_content': f"Skipped post for {trend_data['topic']}",
+                'source_data': trend_data['content'],
+                'citations': trend_data['citations'],
+                'timestamp': datetime.now().isoformat(),
+                'skipped': skip_reason
+            }
         
-        {trend_data['content']}
+        variant_settings = self.config.get('variant_settings', {})
+        if variant_settings.get('enabled', False) and variant_settings.get('variants'):
+            return self.generate_post_variants(trend_data, variant_settings['variants'])
         
-        Create a professional LinkedIn post ({word_count} words) that:
+        cascade_settings = self.config.get('cascade_settings', {})
+        if cascade_settings.get('enabled', False):
+            return self.generate_cascaded_post(trend_data, cascade_settings)
         
-        1. Starts with a compelling hook about the latest development
-        2. Explains why this trend matters to professionals in {self.content_focus}
-        3. Includes specific data points or examples from the research
-        4. Discusses implications for the future
-        {'5. Ends with a thought-provoking question to encourage engagement' if include_questions else '5. Ends with a strong call-to-action or insight'}
-        6. Uses {tone} language
-        {'7. Includes 3-5 relevant hashtags' if include_hashtags else '7. No hashtags needed'}
+        try:
+            post_content, usage, post_seconds = self.request_post("o3", trend_data)
+            self.breakers['openai_chat'].record_success()
+            
+            return {
+                'topic': trend_data['topic'],
+                'post_content': post_content,
+                'model': "o3",
+                'source_data': trend_data['content'],
+                'citations': trend_data['citations'],
+                'usage': usage,
+                'research_usage': trend_data.get('usage', {}),
+                'timings': {**trend_data.get('timings', {}), 'post': post_seconds},
+                'timestamp': datetime.now().isoformat()
+            }
+            
+        except Exception as e:
+            print(f"❌ Error generating post for {trend_data['topic']}: {e}")
+            self.breakers['openai_chat'].record_failure()
+            return {
+                'topic': trend_data['topic'],
+                'post_content': f"Error generating post for {trend_data['topic']}",
+                'source_data': trend_data['content'],
+                'citations': trend_data['citations'],
+                'timestamp': datetime.now().isoformat(),
+                'error': str(e)
+            }
+    
+    def create_chat_completion(self, **params) -> ChatCompletion:
+        """Send a chat completion through the transport"""
+        return self.transport.call(
+            'openai.chat', params,
+            lambda: self.openai_client.chat.completions.create(**params, timeout=self.budget.timeout_for()),
+            encode=lambda response: response.model_dump(mode='json'),
+            decode=ChatCompletion.model_validate
+        )
+    
+    def create_image(self, match: Dict[str, Any], **params) -> ImagesResponse:
+        """Send an image generation through the transport"""
+        return self.transport.call(
+            'openai.images', params,
+            lambda: self.openai_client.images.generate(**params, timeout=self.budget.timeout_for()),
+            encode=lambda response: response.model_dump(mode='json'),
+            decode=ImagesResponse.model_validate,
+            match=match
+        )
+    
+    def request_post(self, model: str, trend_data: Dict[str, Any]) -> Tuple[str, Dict[str, int], float]:
+        """Write a single post with the given model and return its content, usage and latency"""
+        post_settings = self.config.get('post_settings', {})
+        started = time.monotonic()
+        response = self.create_chat_completion(
+            model=model,
+            messages=build_post_messages(self.content_focus, post_settings,
+                                         trend_data['topic'], trend_data['content']),
+            max_completion_tokens=800
+        )
+        return (response.choices[0].message.content,
+                self.record_usage('openai_chat', response.usage),
+                round(time.monotonic() - started, 3))
+    
+    def generate_cascaded_post(self, trend_data: Dict[str, Any], cascade_settings: Dict[str, Any]) -> Dict[str, Any]:
+        """Write a cheap draft first and only escalate to the final model when the quality gate rejects it"""
+        topic = trend_data['topic']
+        draft_model = cascade_settings.get('draft_model', 'gpt-4o-mini')
+        final_model = cascade_settings.get('final_model', 'o3')
+        gate = PostQualityGate(
+            self.config.get('post_settings', {}),
+            min_data_points=cascade_settings.get('min_data_points', 1),
+            word_count_tolerance=cascade_settings.get('word_count_tolerance', 0.1)
+        )
+        cascade = {'draft_model': draft_model, 'final_model': final_model, 'tier': 'draft', 'escalated': False}
+        usage = {'prompt_tokens': 0, 'completion_tokens': 0, 'cached_tokens': 0}
+        post_content = None
         
-        Format: Write as a cohesive LinkedIn post, not bullet points. Make it engaging and shareable.
-        """
+        try:
+            try:
+                post_content, draft_usage, cascade['draft_seconds'] = self.request_post(draft_model, trend_data)
+                gate_result = gate.check(post_content, trend_data['content'])
+                cascade['gate_failures'] = gate_result['failures']
+                cascade['word_count'] = gate_result['word_count']
+                usage = dict(draft_usage)
+            except Exception as e:
+                # A broken cheap tier must never cost us the post, so treat it as a failed draft
+                print(f"⚠️ Draft model failed for {topic}: {e}")
+                cascade['gate_failures'] = ['draft_error']
+            
+            if cascade['gate_failures']:
+                print(f"🔼 Escalating {topic} to {final_model}: {', '.join(cascade['gate_failures'])}")
+                skip_reason = self.check_call_allowed('openai_chat', topic, 'post escalation')
+                if skip_reason and post_content is None:
+                    return {
+                        'topic': topic,
+                        'post_content': f"Skipped post for {topic}",
+                        'source_data': trend_data['content'],
+                        'citations': trend_data['citations'],
+                        'timestamp': datetime.now().isoformat(),
+                        'skipped': skip_reason
+                    }
+                if skip_reason:
+                    # Out of time or the provider is failing, so publish the draft we already paid for
+                    cascade['escalation_skipped'] = skip_reason
+                else:
+                    try:
+                        post_content, final_usage, cascade['final_seconds'] = self.request_post(final_model, trend_data)
+                        usage = {key: usage[key] + final_usage[key] for key in usage}
+                        cascade['tier'] = 'final'
+                        cascade['escalated'] = True
+                    except Exception as e:
+                        if post_content is None:
+                            raise
+                        # Same as a skipped escalation: the draft is already paid for, so publish it
+                        print(f"⚠️ Escalation to {final_model} failed for {topic}, keeping the draft: {e}")
+                        self.breakers['openai_chat'].record_failure()
+                        cascade['escalation_failed'] = str(e)
+            else:
+                print(f"✅ Draft from {draft_model} passed the quality gate")
+            
+            if 'escalation_failed' not in cascade:
+                self.breakers['openai_chat'].record_success()
+            post_seconds = round(cascade.get('draft_seconds', 0.0) + cascade.get('final_seconds', 0.0), 3)
+            
+            return {
+                'topic': topic,
+                'post_content': post_content,
+                'model': final_model if cascade['escalated'] else draft_model,
+                'cascade': cascade,
+                'source_data': trend_data['content'],
+                'citations': trend_data['citations'],
+                'usage': usage,
+                'research_usage': trend_data.get('usage', {}),
+                'timings': {**trend_data.get('timings', {}), 'post': post_seconds},
+                'timestamp': datetime.now().isoformat()
+            }
+            
+        except Exception as e:
+            print(f"❌ Error generating post for {topic}: {e}")
+            self.breakers['openai_chat'].record_failure()
+            return {
+                'topic': topic,
+                'post_content': f"Error generating post for {topic}",
+                'source_data': trend_data['content'],
+                'citations': trend_data['citations'],
+                'timestamp': datetime.now().isoformat(),
+                'error': str(e)
+            }
+    
+    def generate_post_variants(self, trend_data: Dict[str, Any], variants: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Generate several differently-parameterized drafts from one research result in a single call"""
+        print(f"🧪 Generating {len(variants)} post variants in one request")
+        post_settings = self.config.get('post_settings', {})
         
         try:
-            response = self.openai_client.chat.completions.create(
+            started = time.monotonic()
+            response = self.create_chat_completion(
                 model="o3",
-                messages=[
-                    {
-                        "role": "developer",
-                        "content": f"You are a content strategist who creates engaging LinkedIn posts for professionals in {self.content_focus}. Write in a {tone} tone."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                max_completion_tokens=800
+                messages=build_variant_messages(self.content_focus, post_settings, variants,
+                                                trend_data['topic'], trend_data['content']),
+                response_format={"type": "json_object"},
+                max_completion_tokens=800 * len(variants)
             )
             
-            post_content = response.choices[0].message.content
+            drafts = json.loads(response.choices[0].message.content).get('variants', [])
+            if not drafts:
+                raise ValueError("response contained no variants")
+            self.breakers['openai_chat'].record_success()
+            
+            # Pair each draft with the specification it was written for by label, never by position
+            drafts_by_label = {str(draft.get('label', '')).strip().lower(): draft.get('post', '')
+                               for draft in drafts if isinstance(draft, dict)}
+            post_variants = []
+            missing_variants = []
+            for variant in variants:
+                post_content = drafts_by_label.get(variant['label'].strip().lower())
+                if post_content:
+                    post_variants.append({**variant, 'post_content': post_content})
+                else:
+                    missing_variants.append(variant['label'])
+            if not post_variants:
+                raise ValueError("response contained no variant matching a configured label")
+            
+            for label in missing_variants:
+                print(f"⚠️ Variant '{label}' missing from the response for {trend_data['topic']}")
+                self.skipped_topics.append({'topic': trend_data['topic'], 'stage': 'post variant',
+                                            'reason': f"variant '{label}' missing from the response"})
             
             return {
                 'topic': trend_data['topic'],
-                'post_content': post_content,
+                'post_content': post_variants[0]['post_content'],
+                'model': "o3",
+                'variants': post_variants,
+                'missing_variants': missing_variants,
                 'source_data': trend_data['content'],
                 'citations': trend_data['citations'],
+                'usage': self.record_usage('openai_chat', response.usage),
+                'research_usage': trend_data.get('usage', {}),
+                'timings': {**trend_data.get('timings', {}), 'post': round(time.monotonic() - started, 3)},
                 'timestamp': datetime.now().isoformat()
             }
             
         except Exception as e:
-            print(f"❌ Error generating post for {trend_data['topic']}: {e}")
+            print(f"❌ Error generating post variants for {trend_data['topic']}: {e}")
+            self.breakers['openai_chat'].record_failure()
             return {
                 'topic': trend_data['topic'],
                 'post_content': f"Error generating post for {trend_data['topic']}",
                 'source_data': trend_data['content'],
                 'citations': trend_data['citations'],
-                'timestamp': datetime.now().isoformat()
+                'timestamp': datetime.now().isoformat(),
+                'error': str(e)
             }
     
-    def generate_post_image(self, post_data: Dict[str, Any]) -> str:
-        """Generate an image for the LinkedIn post using gpt-image-1"""
-        print(f"🎨 Generating image for: {post_data['topic']}")
-        
+    def render_topic_image(self, topic: str, quality: Optional[str] = None, content_focus: Optional[str] = None) -> bytes:
+        """Render a fresh image for a topic with gpt-image-1 and return the PNG bytes"""
+        content_focus = content_focus or self.content_focus
         # Generate unique timestamp for this session
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         
@@ -217,9 +581,9 @@ class ContentAutomation:
             "with clean orange details"
         ])
         
-        # Create image prompt based on the post content
+        # Create image prompt based on the topic
         image_prompt = f"""
-        Create a unique professional image for a LinkedIn post about {post_data['topic']} in the context of {self.content_focus}. 
+        Create a unique professional image for a LinkedIn post about {topic} in the context of {content_focus}. 
         The image should be:
         - Clean and professional business/tech aesthetic
         - Include subtle relevant elements (digital interfaces, charts, modern icons)
@@ -232,51 +596,109 @@ class ContentAutomation:
         Style: {selected_style} {color_emphasis}, ensuring this is a completely fresh and unique image
         """
         
+        # The prompt is randomized, so replays find the recorded image by topic and quality
+        response = self.create_image(
+            {'topic': topic, 'quality': quality},
+            model="gpt-image-1",
+            prompt=image_prompt,
+            size="1024x1024",
+            n=1,
+            **({'quality': quality} if quality and quality != AUTO_TIER else {})
+        )
+        
+        # Get base64 image data and decode
+        return base64.b64decode(response.data[0].b64_json)
+    
+    def new_image_filename(self, topic: str) -> str:
+        """Unique image path for a topic under images/"""
+        # Create images directory if it doesn't exist
+        os.makedirs('images', exist_ok=True)
+        
+        # Save image with topic name and timestamp for uniqueness
+        safe_topic = "".join(c for c in topic if c.isalnum() or c in (' ', '-', '_')).rstrip()
+        unique_timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')[:-3]  # Include microseconds for uniqueness
+        return f"images/{safe_topic.replace(' ', '_').lower()}_{unique_timestamp}.png"
+    
+    def choose_image_tier(self, post_data: Dict[str, Any]) -> Optional[str]:
+        """Pick the image quality tier for a post from the time left in the run"""
+        if not self.image_settings.get('adaptive_quality', True):
+            return None
+        
+        if post_data.get('timings', {}).get('post') is not None:
+            self.image_policy.observe_post(post_data['timings']['post'])
+        tier = self.image_policy.choose(self.budget.remaining(), self.images_remaining)
+        if tier != self.image_policy.tiers[0]:
+            print(f"⏩ Behind schedule, rendering at {tier} quality")
+        return tier
+    
+    def generate_post_image(self, post_data: Dict[str, Any]) -> str:
+        """Generate an image for the LinkedIn post using gpt-image-1"""
+        print(f"🎨 Generating image for: {post_data['topic']}")
+        
+        # A pre-generated image from the warm pool is free and instant
+        if self.image_pool:
+            image_filename = self.new_image_filename(post_data['topic'])
+            if self.image_pool.take(post_data['topic'], self.content_focus, image_filename):
+                print("🧊 Using pre-generated image from the pool")
+                post_data['image_source'] = 'pool'
+                post_data.setdefault('timings', {})['image'] = 0.0
+                return image_filename
+        
+        if self.check_call_allowed('openai_images', post_data['topic'], 'image'):
+            return ""
+        
+        tier = self.choose_image_tier(post_data)
+        
         try:
-            response = self.openai_client.images.generate(
-                model="gpt-image-1",
-                prompt=image_prompt,
-                size="1024x1024",
-                n=1
-            )
-            
-            # Get base64 image data and decode
-            image_b64 = response.data[0].b64_json
-            image_bytes = base64.b64decode(image_b64)
-            
-            # Create images directory if it doesn't exist
-            os.makedirs('images', exist_ok=True)
-            
-            # Save image with topic name and timestamp for uniqueness
-            safe_topic = "".join(c for c in post_data['topic'] if c.isalnum() or c in (' ', '-', '_')).rstrip()
-            unique_timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')[:-3]  # Include microseconds for uniqueness
-            image_filename = f"images/{safe_topic.replace(' ', '_').lower()}_{unique_timestamp}.png"
+            started = time.monotonic()
+            image_bytes = self.render_topic_image(post_data['topic'], tier)
+            image_filename = self.new_image_filename(post_data['topic'])
             
             with open(image_filename, 'wb') as f:
                 f.write(image_bytes)
             
+            self.breakers['openai_images'].record_success()
+            image_seconds = round(time.monotonic() - started, 3)
+            post_data['image_source'] = 'generated'
+            post_data.setdefault('timings', {})['image'] = image_seconds
+            
+            if tier:
+                self.image_policy.observe_image(tier, image_seconds)
+                post_data['image_tier'] = tier
+                if tier != self.image_policy.tiers[0] and self.image_settings.get('rerender_high_quality', True):
+                    self.create_rerender_queue().add(post_data['topic'], self.content_focus, image_filename, tier)
+                    post_data['image_rerender_queued'] = True
             return image_filename
             
         except Exception as e:
             print(f"❌ Error generating image for {post_data['topic']}: {e}")
+            self.breakers['openai_images'].record_failure()
             return ""
     
-    def run_automation(self, interactive_mode: bool = True):
+    def run_automation(self, interactive_mode: bool = True, deadline_minutes: Optional[float] = None,
+                       topic_stream: Optional[Iterable[str]] = None):
         """Run the complete automation process"""
         print("🚀 Starting TrendForge Content Automation...")
         print(f"📋 Content Focus: {self.content_focus}")
         
-        # Topic selection
-        if interactive_mode:
-            print("\n" + "="*50)
-            print("TOPIC SELECTION")
-            print("="*50)
-            self.topics = self.topic_selector.interactive_selection()
-        else:
-            self.topics = self.config['topics']
+        # Large inventories are streamed instead of being selected from topics.json
+        if topic_stream is None and self.config.get('topic_source'):
+            topic_stream = stream_topics(open_topic_source(self.config['topic_source']))
+        if topic_stream is not None:
+            return self.run_streaming(topic_stream, deadline_minutes)
+        
+        # Topic selection (a replay reuses the recorded selection instead of asking again)
+        self.topics = self.transport.remember('topics', lambda: self.select_topics(interactive_mode))
+        
+        # The deadline starts counting once topics are chosen
+        self.budget = self.create_budget(deadline_minutes)
+        if self.topic_scheduler and self.priority_settings.get('enabled', False):
+            self.topics = self.prioritize_topics(self.topics)
         
         print(f"\n📅 Researching trends from the past 30 days")
         print(f"📊 Topics to research: {len(self.topics)}")
+        if self.budget.deadline_seconds:
+            print(f"⏱️ Run deadline: {self.budget.deadline_seconds / 60:g} minutes")
         
         # Step 1: Scrape latest trends for all topics
         print("\n" + "="*50)
@@ -289,7 +711,8 @@ class ContentAutomation:
             self.scraped_data.append(trend_data)
             
             # Add delay to respect API rate limits
-            time.sleep(2)
+            if not trend_data.get('skipped'):
+                self.budget.sleep(2)
         
         print(f"\n✅ Completed scraping {len(self.scraped_data)} topics")
         
@@ -298,36 +721,242 @@ class ContentAutomation:
         print("STEP 2: GENERATING LINKEDIN POSTS")
         print("="*50)
         
-        # Select top 5-8 most promising topics based on content quality
-        quality_topics = [data for data in self.scraped_data if len(data['content']) > 200 and 'Error' not in data['content']]
-        selected_topics = quality_topics[:8]  # Take top 8 topics
+        selected_topics = self.select_quality_topics(self.scraped_data)
+        
+        # Stream each finished post to the bulk export as it is produced
+        exporter = self.open_export()
         
         for i, trend_data in enumerate(selected_topics, 1):
             print(f"\n[{i}/{len(selected_topics)}] Generating post for: {trend_data['topic']}")
-            post_data = self.generate_linkedin_post(trend_data)
+            self.images_remaining = len(selected_topics) - i + 1
+            self.produce_post(trend_data, exporter)
+        
+        self.finish_run(exporter)
+    
+    def select_topics(self, interactive_mode: bool) -> List[str]:
+        """Ask for the topics to process, or use all configured topics"""
+        if interactive_mode:
+            print("\n" + "="*50)
+            print("TOPIC SELECTION")
+            print("="*50)
+            return self.topic_selector.interactive_selection()
+        return self.config['topics']
+    
+    def produce_post(self, trend_data: Dict[str, Any], exporter: Optional[ResultExporter]) -> bool:
+        """Generate the post and image for one research result; False if the post was skipped"""
+        post_data = self.generate_linkedin_post(trend_data)
+        if post_data.get('skipped'):
+            return False
+        
+        # Generate image for the post
+        image_path = self.generate_post_image(post_data)
+        post_data['image_path'] = image_path
+        
+        self.generated_posts.append(post_data)
+        self.record_coverage(post_data)
+        if exporter:
+            exporter.write_post(post_data)
+        
+        # Add delay between OpenAI calls
+        self.budget.sleep(1)
+        return True
+    
+    def run_streaming(self, topic_stream: Iterable[str], deadline_minutes: Optional[float] = None):
+        """Research topics as they are read from a stream and write posts as soon as they qualify
+        
+        Only the research of topics that made the cut is kept, so memory stays flat however
+        large the inventory is. The stream is only read as fast as the pipeline consumes it.
+        """
+        self.budget = self.create_budget(deadline_minutes)
+        max_posts = self.run_settings.get('max_posts', 8)
+        self.topics = []
+        self.topic_count = 0
+        downgraded = []
+        posts_written = 0
+        
+        print(f"\n📅 Researching trends from the past 30 days")
+        print(f"🌊 Streaming topics until {max_posts} posts are written")
+        if self.budget.deadline_seconds:
+            print(f"⏱️ Run deadline: {self.budget.deadline_seconds / 60:g} minutes")
+        
+        if self.topic_scheduler and self.priority_settings.get('enabled', False):
+            topic_stream = self.topic_scheduler.prioritize_stream(topic_stream, self.priority_settings.get('window', 100))
+        
+        exporter = self.open_export()
+        for topic in topic_stream:
+            if self.budget.expired():
+                self.skipped_topics.append({'topic': 'remaining topics', 'stage': 'research',
+                                            'reason': "run deadline reached; no further topics were read"})
+                break
             
-            # Generate image for the post
-            image_path = self.generate_post_image(post_data)
-            post_data['image_path'] = image_path
+            # Hold the stream while Perplexity cools down instead of skipping through the inventory
+            retry_after = self.breakers['perplexity'].retry_after()
+            if retry_after:
+                print(f"⏸️ Waiting {retry_after:.0f}s for the perplexity circuit breaker")
+                self.budget.sleep(retry_after)
             
-            self.generated_posts.append(post_data)
+            self.topic_count += 1
+            self.compact_skipped_topics()
+            print(f"\n[{self.topic_count}] Processing: {topic}")
+            trend_data = self.scrape_latest_trends(topic)
+            if trend_data.get('skipped'):
+                continue
+            self.budget.sleep(2)
             
-            # Add delay between OpenAI calls
-            time.sleep(1)
+            selected = self.select_quality_topics([trend_data])
+            if not selected:
+                continue
+            if selected[0].get('coverage', {}).get('decision') == 'downgrade':
+                # Partly covered stories only fill the slots left at the end of the stream
+                if len(downgraded) < max_posts:
+                    downgraded.append(trend_data)
+                continue
+            
+            self.topics.append(topic)
+            self.images_remaining = max_posts - posts_written
+            if self.produce_post(trend_data, exporter):
+                posts_written += 1
+            if posts_written >= max_posts:
+                break
+        
+        leftover = downgraded[:max_posts - posts_written]
+        for i, trend_data in enumerate(leftover):
+            self.topics.append(trend_data['topic'])
+            self.images_remaining = len(leftover) - i
+            self.produce_post(trend_data, exporter)
+        
+        print(f"\n✅ Researched {self.topic_count} streamed topics")
+        self.finish_run(exporter)
+    
+    def compact_skipped_topics(self):
+        """Keep the skip list bounded however many streamed topics are skipped"""
+        excess = len(self.skipped_topics) - MAX_SKIP_DETAILS
+        if excess > 0:
+            del self.skipped_topics[MAX_SKIP_DETAILS:]
+            self.skipped_overflow += excess
+    
+    def finish_run(self, exporter: Optional[ResultExporter]):
+        """Close the export, write the report and refill the image pool"""
+        if exporter:
+            exporter.close()
+        self.compact_skipped_topics()
         
         print(f"\n✅ Generated {len(self.generated_posts)} LinkedIn posts with images")
         
-        # Step 3: Save to HTML file
+        # Step 3: Save to HTML file (partial runs still get a report)
         report_file = self.save_to_html()
         
-        print("\n🎉 Automation completed successfully!")
+        if self.skipped_topics:
+            print(f"\n⚠️ Run finished with {len(self.skipped_topics) + self.skipped_overflow} skipped steps (see report for details)")
+        else:
+            print("\n🎉 Automation completed successfully!")
         print(f"📄 Results saved to: {report_file}")
+        if exporter:
+            print(f"📦 Bulk export saved to: {exporter.jsonl_path}")
         print(f"🖼️ Images saved to: images/ directory")
+        
+        self.refill_image_pool()
+    
+    def refill_image_pool(self):
+        """Top the image pool back up for this run's topics in a background process"""
+        pool_settings = self.config.get('image_pool_settings', {})
+        if not self.image_pool or not pool_settings.get('refill_after_run', True):
+            return
+        
+        shortfall = self.image_pool.needed([post['topic'] for post in self.generated_posts], self.content_focus)
+        if shortfall:
+            print(f"🧊 Refilling image pool for {len(shortfall)} topics in the background")
+            start_background_refill(self.config_file, list(shortfall),
+                                    pool_settings.get('refill_budget_images', sum(shortfall.values())))
+    
+    def get_report_stem(self) -> str:
+        """Return the timestamped path (without extension) shared by this run's report and exports"""
+        if self.report_stem is None:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            safe_focus = "".join(c for c in self.content_focus if c.isalnum() or c in (' ', '-', '_')).rstrip()
+            self.report_stem = f'reports/content_report_{safe_focus.replace(" ", "_").lower()}_{timestamp}'
+        return self.report_stem
+    
+    def open_export(self) -> Optional[ResultExporter]:
+        """Open the JSONL (and optional Parquet) export for this run, if enabled"""
+        export_settings = self.config.get('export_settings', {})
+        if not export_settings.get('jsonl', True):
+            return None
+        
+        stem = self.get_report_stem()
+        parquet_path = f'{stem}.parquet' if export_settings.get('parquet', False) else None
+        return ResultExporter(f'{stem}.jsonl', parquet_path, self.content_focus)
+    
+    def save_to_jsonl(self) -> Optional[str]:
+        """Export all generated posts in one go (used when posts were not streamed)"""
+        exporter = self.open_export()
+        if not exporter:
+            return None
+        
+        with exporter:
+            for post in self.generated_posts:
+                exporter.write_post(post)
+        return exporter.jsonl_path
+    
+    def enrich_citations(self) -> Dict[str, Dict[str, Any]]:
+        """Resolve titles, publishers and dates for every citation in the generated posts"""
+        citation_settings = self.config.get('citation_settings', {})
+        if not citation_settings.get('enabled', True) or self.budget.expired():
+            return {}
+        
+        max_per_post = citation_settings.get('max_per_post', 5)
+        urls = [url for post in self.generated_posts for url in post.get('citations', [])[:max_per_post]]
+        if not urls:
+            return {}
+        
+        enricher = CitationEnricher(
+            cache_file=citation_settings.get('cache_file', 'data/citation_cache.json'),
+            ttl_hours=citation_settings.get('ttl_hours', 168),
+            failure_ttl_hours=citation_settings.get('failure_ttl_hours', 24),
+            concurrency=citation_settings.get('concurrency', 8),
+            timeout=citation_settings.get('timeout_seconds', 10)
+        )
+        return enricher.enrich(urls, timeout=self.budget.timeout_for(enricher.timeout), offline=self.transport.offline)
+    
+    def format_citations(self, citations: List[str], citation_metadata: Dict[str, Dict[str, Any]]) -> str:
+        """Render a post's citations as links with title, publisher and publish date"""
+        if not citations:
+            return ""
+        
+        max_per_post = self.config.get('citation_settings', {}).get('max_per_post', 5)
+        items = []
+        for url in citations[:max_per_post]:
+            metadata = citation_metadata.get(url, {})
+            title = html.escape(metadata.get('title') or url)
+            details = " · ".join(html.escape(value) for value in (metadata.get('publisher'), metadata.get('published')) if value)
+            items.append(f'<a href="{html.escape(url)}" target="_blank">{title}</a>' + (f' <span class="citation-meta">{details}</span>' if details else ''))
+        
+        return f'<div class="citations"><strong>Sources:</strong><br>{"<br>".join(items)}</div>'
+    
+    def format_post_body(self, post: Dict[str, Any]) -> str:
+        """Render a post, or its variants side by side when variants mode produced several drafts"""
+        if not post.get('variants'):
+            return f'<div class="post-content">{post["post_content"]}</div>'
+        
+        columns = ""
+        for variant in post['variants']:
+            spec_parts = [variant.get('audience'), variant.get('tone')]
+            if variant.get('word_count_range'):
+                spec_parts.append(f"{variant['word_count_range']} words")
+            spec = " · ".join(part for part in spec_parts if part)
+            columns += (
+                f'<div class="variant"><div class="variant-label">{variant["label"]}'
+                f'<span class="variant-spec">{spec}</span></div>'
+                f'<div class="post-content">{variant["post_content"]}</div></div>'
+            )
+        return f'<div class="variants">{columns}</div>'
     
     def save_to_html(self):
         """Save all generated content to an HTML file for review"""
         print("\n📄 Generating HTML report...")
         
+        citation_metadata = self.enrich_citations()
+        
         html_content = f"""
         <!DOCTYPE html>
         <html lang="en">
@@ -414,6 +1043,25 @@ class ContentAutomation:
                     font-size: 1.1em; 
                     line-height: 1.7; 
                 }}
+                .variants {{ 
+                    display: grid; 
+                    grid-template-columns: repeat(auto-fit, minmax(300px, 1fr)); 
+                    gap: 20px; 
+                }}
+                .variant .post-content {{ 
+                    margin-top: 10px; 
+                    font-size: 1em; 
+                }}
+                .variant-label {{ 
+                    font-weight: bold; 
+                    color: #007acc; 
+                }}
+                .variant-spec {{ 
+                    display: block; 
+                    font-weight: normal; 
+                    color: #6c757d; 
+                    font-size: 0.85em; 
+                }}
                 .post-image {{ 
                     text-align: center; 
                     margin: 20px 0; 
@@ -430,6 +1078,29 @@ class ContentAutomation:
                     border-radius: 6px; 
                     border-left: 4px solid #ffc107; 
                 }}
+                .usage {{ 
+                    margin-bottom: 30px; 
+                    padding: 15px 20px; 
+                    background: #f8f9fa; 
+                    border-radius: 6px; 
+                    color: #495057; 
+                    font-size: 0.95em; 
+                }}
+                .skipped {{ 
+                    margin-bottom: 40px; 
+                    padding: 15px 20px; 
+                    background: #f8d7da; 
+                    border-radius: 6px; 
+                    border-left: 4px solid #dc3545; 
+                    color: #721c24; 
+                }}
+                .skipped ul {{ 
+                    margin: 10px 0 0 0; 
+                }}
+                .citation-meta {{ 
+                    color: #6c757d; 
+                    font-size: 0.9em; 
+                }}
                 .timestamp {{ 
                     color: #6c757d; 
                     font-size: 0.9em; 
@@ -458,7 +1129,7 @@ class ContentAutomation:
                 
                 <div class="stats">
                     <div class="stat-item">
-                        <div class="stat-number">{len(self.topics)}</div>
+                        <div class="stat-number">{self.topic_count if self.topic_count is not None else len(self.topics)}</div>
                         <div>Topics Researched</div>
                     </div>
                     <div class="stat-item">
@@ -469,9 +1140,104 @@ class ContentAutomation:
                         <div class="stat-number">{len([p for p in self.generated_posts if p.get('image_path')])}</div>
                         <div>Images Created</div>
                     </div>
+                    <div class="stat-item">
+                        <div class="stat-number">{len(self.skipped_topics) + self.skipped_overflow}</div>
+                        <div>Steps Skipped</div>
+                    </div>
                 </div>
         """
         
+        # Token usage per provider, including prompt tokens served from the provider cache
+        if self.usage_totals:
+            usage_lines = "<br>".join(
+                f"{provider}: {totals['prompt_tokens']} prompt tokens "
+                f"({totals['cached_tokens']} cached), {totals['completion_tokens']} completion tokens"
+                for provider, totals in self.usage_totals.items()
+            )
+            html_content += f"""
+                <div class="usage"><strong>Token Usage:</strong><br>{usage_lines}</div>
+            """
+        
+        # Warm image pool depth, age and hit rate
+        if self.image_pool:
+            pool_metrics = self.image_pool.get_metrics(self.topics, self.content_focus)
+            run_hits = len([p for p in self.generated_posts if p.get('image_source') == 'pool'])
+            run_lookups = len([p for p in self.generated_posts if p.get('image_source')])
+            run_hit_rate = f"{run_hits / run_lookups:.0%}" if run_lookups else "-"
+            overall_hit_rate = f"{pool_metrics['hit_rate']:.0%}" if pool_metrics['hit_rate'] is not None else "-"
+            oldest_age = pool_metrics['oldest_age_hours'] if pool_metrics['oldest_age_hours'] is not None else "-"
+            html_content += f"""
+                <div class="usage"><strong>Image Pool:</strong>
+                    {pool_metrics['pooled_images']} images pooled, {pool_metrics['topics_at_depth']}/{len(self.topics)} topics at target depth {pool_metrics['target_depth']},
+                    oldest {oldest_age}h (max age {pool_metrics['max_age_hours']:g}h)<br>
+                    Hit rate: {run_hit_rate} this run ({run_hits} of {run_lookups} images), {overall_hit_rate} overall
+                </div>
+            """
+        
+        # Image quality tiers chosen to keep the run on schedule
+        tiered_posts = [p for p in self.generated_posts if p.get('image_tier')]
+        if tiered_posts:
+            tier_lines = []
+            for tier in self.image_policy.tiers:
+                latencies = [p['timings']['image'] for p in tiered_posts
+                             if p['image_tier'] == tier and p.get('timings', {}).get('image') is not None]
+                if latencies:
+                    tier_lines.append(f"{tier}: {len(latencies)} images, {sum(latencies) / len(latencies):.1f}s average")
+            rerenders = len([p for p in tiered_posts if p.get('image_rerender_queued')])
+            html_content += f"""
+                <div class="usage"><strong>Image Quality Tiers:</strong> {"; ".join(tier_lines) or "-"}<br>
+                    {rerenders} images queued for a re-render at the top tier
+                </div>
+            """
+        
+        # Draft-then-escalate cascade: per-tier latency and escalation rate for tuning the gate
+        cascaded_posts = [p for p in self.generated_posts if p.get('cascade')]
+        if cascaded_posts:
+            escalated = [p for p in cascaded_posts if p['cascade']['escalated']]
+            draft_times = [p['cascade']['draft_seconds'] for p in cascaded_posts if 'draft_seconds' in p['cascade']]
+            final_times = [p['cascade']['final_seconds'] for p in escalated if 'final_seconds' in p['cascade']]
+            failure_counts = {}
+            for post in cascaded_posts:
+                for failure in post['cascade'].get('gate_failures', []):
+                    failure_counts[failure] = failure_counts.get(failure, 0) + 1
+            failure_summary = ", ".join(f"{name}: {count}" for name, count in failure_counts.items()) or "none"
+            draft_latency = f"{sum(draft_times) / len(draft_times):.1f}s" if draft_times else "-"
+            final_latency = f"{sum(final_times) / len(final_times):.1f}s" if final_times else "-"
+            kept_drafts = len([p for p in cascaded_posts
+                               if 'escalation_skipped' in p['cascade'] or 'escalation_failed' in p['cascade']])
+            html_content += f"""
+                <div class="usage"><strong>Model Cascade:</strong>
+                    {len(escalated)} of {len(cascaded_posts)} drafts escalated ({len(escalated) / len(cascaded_posts):.0%}){f", {kept_drafts} failing drafts kept because escalation was skipped or failed" if kept_drafts else ""}<br>
+                    Average latency: {cascaded_posts[0]['cascade']['draft_model']} {draft_latency}, {cascaded_posts[0]['cascade']['final_model']} {final_latency}<br>
+                    Gate failures: {failure_summary}
+                </div>
+            """
+        
+        # Partial runs clearly list everything that did not run
+        if self.skipped_topics:
+            skipped_items = "".join(
+                f"<li><strong>{item['topic']}</strong> ({item['stage']}): {item['reason']}</li>"
+                for item in self.skipped_topics
+            )
+            if self.skipped_overflow:
+                skipped_items += f"<li>... and {self.skipped_overflow} more</li>"
+            breaker_states = ", ".join(
+                f"{name}: {stats['state']} ({stats['total_failures']} failures, {stats['rejected_calls']} calls rejected)"
+                for name, stats in ((name, breaker.get_stats()) for name, breaker in self.breakers.items())
+            )
+            budget_stats = self.budget.get_stats()
+            deadline_note = (f" of the {budget_stats['deadline_seconds'] / 60:g}-minute deadline"
+                             f"{' (deadline reached)' if budget_stats['expired'] else ''}"
+                             if budget_stats['deadline_seconds'] else "")
+            html_content += f"""
+                <div class="skipped">
+                    <strong>⚠️ Partial run:</strong> {len(self.skipped_topics) + self.skipped_overflow} steps were skipped
+                    after {budget_stats['elapsed_seconds'] / 60:.1f} minutes{deadline_note}.
+                    <ul>{skipped_items}</ul>
+                    <p>Circuit breakers: {breaker_states}</p>
+                </div>
+            """
+        
         # Add each generated post
         for i, post in enumerate(self.generated_posts, 1):
             # Fix image path to be relative from reports/ folder
@@ -486,11 +1252,12 @@ class ContentAutomation:
                         <h2 class="post-title">#{i}: {post['topic']}</h2>
                     </div>
                     
-                    <div class="post-content">{post['post_content']}</div>
+                    {self.format_post_body(post)}
                     
                     {f'<div class="post-image"><img src="{image_path}" alt="Generated image for {post["topic"]}" /></div>' if image_path else ''}
+                    {f'<div class="citation-meta">Image quality: {post["image_tier"]}{" (re-render queued)" if post.get("image_rerender_queued") else ""}</div>' if image_path and post.get('image_tier') else ''}
                     
-                    {f'<div class="citations"><strong>Sources:</strong><br>{"<br>".join(post["citations"][:3]) if post["citations"] else "Real-time web research"}</div>' if post.get('citations') else ''}
+                    {self.format_citations(post.get('citations', []), citation_metadata)}
                     
                     <div class="timestamp">Generated: {post['timestamp']}</div>
                 </div>
@@ -514,10 +1281,7 @@ class ContentAutomation:
         # Create reports directory if it doesn't exist
         os.makedirs('reports', exist_ok=True)
         
-        # Generate filename with timestamp
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        safe_focus = "".join(c for c in self.content_focus if c.isalnum() or c in (' ', '-', '_')).rstrip()
-        report_filename = f'reports/content_report_{safe_focus.replace(" ", "_").lower()}_{timestamp}.html'
+        report_filename = f'{self.get_report_stem()}.html'
         
         # Save HTML file
         with open(report_filename, 'w', encoding='utf-8') as f:
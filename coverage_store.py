@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Cross-run Coverage Fingerprints
+Remembers the entities, numbers and URLs of previously generated posts so new
+research about an already-published story can be skipped or downgraded before
+paying for post and image generation
+"""
+
+import os
+import re
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import List, Dict, Any, Iterator, Set
+from urllib.parse import urlparse
+
+# Multi-word proper nouns such as "Acme Robotics" or "European Central Bank"
+ENTITY_PATTERN = re.compile(r"\b[A-Z][\w&.-]*[A-Za-z0-9](?:\s+(?:of\s+|for\s+|&\s+)?[A-Z][\w&.-]*[A-Za-z0-9])+")
+# Money amounts, percentages and scaled figures such as "$40M", "35%" or "2.5 billion"
+NUMBER_PATTERN = re.compile(
+    r"[$€£]\s?\d[\d,]*(?:\.\d+)?\s?(?:[kmbt]n?\b|thousand|million|billion|trillion)?"
+    r"|\d[\d,]*(?:\.\d+)?\s?(?:%|percent\b|thousand\b|million\b|billion\b|trillion\b)",
+    re.IGNORECASE
+)
+
+SCALE_SUFFIXES = {'thousand': 'k', 'million': 'm', 'billion': 'b', 'trillion': 't', 'percent': '%', 'bn': 'b'}
+
+# How much a shared fingerprint says about covering the same story
+FINGERPRINT_WEIGHTS = {'url': 3.0, 'num': 2.0, 'ent': 1.0}
+
+
+def normalize_number(raw: str) -> str:
+    """Collapse "$40 million", "$40M" and "$40m" into one fingerprint"""
+    value = raw.lower().replace(',', '').replace(' ', '')
+    for word, suffix in SCALE_SUFFIXES.items():
+        if value.endswith(word):
+            value = value[:-len(word)] + suffix
+            break
+    return value
+
+
+def normalize_url(url: str) -> str:
+    """Drop scheme, query, fragment and trailing slash so the same article always matches"""
+    parsed = urlparse(url.strip())
+    netloc = parsed.netloc.lower()
+    if netloc.startswith('www.'):
+        netloc = netloc[4:]
+    return f"{netloc}{parsed.path.rstrip('/')}"
+
+
+def extract_fingerprints(text: str, urls: List[str]) -> Set[str]:
+    """Return the entity, number and URL fingerprints of a piece of content"""
+    fingerprints = set()
+    for match in ENTITY_PATTERN.findall(text):
+        entity = re.sub(r"^(?:the|a|an)\s+", "", ' '.join(match.lower().split()))
+        if ' ' in entity:
+            fingerprints.add(f"ent:{entity}")
+    for match in NUMBER_PATTERN.findall(text):
+        fingerprints.add(f"num:{normalize_number(match)}")
+    for url in urls:
+        if isinstance(url, str) and url.startswith(('http://', 'https://')):
+            fingerprints.add(f"url:{normalize_url(url)}")
+    return fingerprints
+
+
+def weighted_size(fingerprints: Set[str]) -> float:
+    """Sum of fingerprint weights"""
+    return sum(FINGERPRINT_WEIGHTS[fingerprint.split(':', 1)[0]] for fingerprint in fingerprints)
+
+
+class CoverageStore:
+    def __init__(self, db_path: str = "data/coverage.db"):
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self.create_tables()
+
+    @contextmanager
+    def connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection that commits on success"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def create_tables(self):
+        """Create the fingerprint schema if it does not exist yet"""
+        with self.connect() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS stories (
+                    story_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    topic TEXT NOT NULL,
+                    content_focus TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS fingerprints (
+                    fingerprint TEXT NOT NULL,
+                    story_id INTEGER NOT NULL,
+                    content_focus TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                );
+                -- Lookups go straight to matching fingerprints, so checks stay fast as history grows
+                CREATE INDEX IF NOT EXISTS idx_fingerprints_focus_lookup
+                    ON fingerprints (content_focus, fingerprint, created_at);
+            """)
+
+    def record_story(self, topic: str, content_focus: str, text: str, urls: List[str]) -> int:
+        """Store the fingerprints of a generated post"""
+        fingerprints = extract_fingerprints(text, urls)
+        now = time.time()
+        with self.connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO stories (topic, content_focus, created_at) VALUES (?, ?, ?)",
+                (topic, content_focus, now)
+            )
+            story_id = cursor.lastrowid
+            conn.executemany(
+                "INSERT INTO fingerprints (fingerprint, story_id, content_focus, created_at) VALUES (?, ?, ?, ?)",
+                [(fingerprint, story_id, content_focus, now) for fingerprint in fingerprints]
+            )
+        return story_id
+
+    def check(self, text: str, urls: List[str], content_focus: str, lookback_days: float = 90) -> Dict[str, Any]:
+        """Score how much of new research is already covered by earlier stories in the same content focus"""
+        fingerprints = extract_fingerprints(text, urls)
+        if not fingerprints:
+            return {'score': 0.0, 'matched': [], 'story_ids': []}
+
+        since = time.time() - lookback_days * 86400
+        placeholders = ",".join("?" for _ in fingerprints)
+        with self.connect() as conn:
+            rows = conn.execute(
+                f"SELECT story_id, fingerprint FROM fingerprints "
+                f"WHERE content_focus = ? AND fingerprint IN ({placeholders}) AND created_at >= ?",
+                (content_focus, *fingerprints, since)
+            ).fetchall()
+
+        # Developments may have been covered by different earlier posts, so score the union
+        matched = {fingerprint for _, fingerprint in rows}
+        return {
+            'score': round(weighted_size(matched) / weighted_size(fingerprints), 3),
+            'matched': sorted(matched),
+            'story_ids': sorted({story_id for story_id, _ in rows})
+        }
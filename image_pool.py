@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Warm Pool of Pre-generated Topic Images
+Images only depend on the topic and content focus, so they can be rendered ahead
+of time during idle hours. A run takes a ready image instantly and the pool is
+refilled afterwards.
+
+Usage (e.g. from cron during idle hours):
+    python image_pool.py fill [--max-images 10] [--max-minutes 30]
+    python image_pool.py status
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Iterator
+
+
+class ImagePool:
+    def __init__(self, pool_dir: str = "images/pool", depth: int = 2, max_age_hours: float = 72):
+        self.pool_dir = pool_dir
+        self.depth = depth
+        self.max_age_seconds = max_age_hours * 3600
+        self.stats_db = os.path.join(pool_dir, "pool_stats.db")
+        os.makedirs(pool_dir, exist_ok=True)
+        self.create_tables()
+
+    @contextmanager
+    def connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection to the stats database that commits on success"""
+        conn = sqlite3.connect(self.stats_db, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def create_tables(self):
+        """Create the hit/miss counters if they do not exist yet"""
+        with self.connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS pool_stats (name TEXT PRIMARY KEY, count INTEGER NOT NULL)")
+            conn.executemany("INSERT OR IGNORE INTO pool_stats (name, count) VALUES (?, ?)",
+                             [('hits', 0), ('misses', 0)])
+
+    @staticmethod
+    def pool_key(topic: str, content_focus: str) -> str:
+        """Filename-safe key for a topic within a content focus"""
+        safe_topic = "".join(c for c in topic if c.isalnum() or c in (' ', '-', '_')).rstrip()
+        focus_hash = hashlib.sha1(content_focus.encode('utf-8')).hexdigest()[:8]
+        return f"{safe_topic.replace(' ', '_').lower()}_{focus_hash}"
+
+    def list_images(self, key: str) -> List[Dict[str, Any]]:
+        """Return pooled images for a key, oldest first
+
+        The directory itself is the index: files are named <key>__<created_ms>_<id>.png,
+        so concurrent runs and workers never fight over a shared index file.
+        """
+        images = []
+        prefix = f"{key}__"
+        for entry in os.scandir(self.pool_dir):
+            if entry.name.startswith(prefix) and entry.name.endswith('.png'):
+                created_ms = entry.name[len(prefix):-len('.png')].split('_')[0]
+                if created_ms.isdigit():
+                    images.append({'path': entry.path, 'created_at': int(created_ms) / 1000})
+        return sorted(images, key=lambda image: image['created_at'])
+
+    def prune_expired(self, key: Optional[str] = None) -> int:
+        """Delete pooled images older than the age limit"""
+        removed = 0
+        cutoff = time.time() - self.max_age_seconds
+        for entry in os.scandir(self.pool_dir):
+            if not entry.name.endswith('.png') or (key and not entry.name.startswith(f"{key}__")):
+                continue
+            created_ms = entry.name.rsplit('__', 1)[-1][:-len('.png')].split('_')[0]
+            if created_ms.isdigit() and int(created_ms) / 1000 < cutoff:
+                try:
+                    os.remove(entry.path)
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+        return removed
+
+    def add(self, topic: str, content_focus: str, image_bytes: bytes) -> str:
+        """Store a freshly rendered image in the pool"""
+        key = self.pool_key(topic, content_focus)
+        path = os.path.join(self.pool_dir, f"{key}__{int(time.time() * 1000)}_{uuid.uuid4().hex[:6]}.png")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(image_bytes)
+        os.replace(tmp_path, path)
+        return path
+
+    def take(self, topic: str, content_focus: str, destination: str) -> bool:
+        """Move the oldest fresh pooled image to destination; False on a pool miss"""
+        key = self.pool_key(topic, content_focus)
+        self.prune_expired(key)
+
+        for image in self.list_images(key):
+            try:
+                # os.replace is atomic, so two processes can never take the same image
+                os.replace(image['path'], destination)
+            except FileNotFoundError:
+                continue
+            self.record(hit=True)
+            return True
+
+        self.record(hit=False)
+        return False
+
+    def needed(self, topics: List[str], content_focus: str) -> Dict[str, int]:
+        """Return how many images each topic is short of the target depth"""
+        shortfall = {}
+        for topic in topics:
+            key = self.pool_key(topic, content_focus)
+            self.prune_expired(key)
+            missing = self.depth - len(self.list_images(key))
+            if missing > 0:
+                shortfall[topic] = missing
+        return shortfall
+
+    def record(self, hit: bool):
+        """Count a pool hit or miss in the cumulative stats"""
+        # A single UPDATE is atomic, so concurrent runs and workers never lose a count
+        with self.connect() as conn:
+            conn.execute("UPDATE pool_stats SET count = count + 1 WHERE name = ?", ('hits' if hit else 'misses',))
+
+    def load_stats(self) -> Dict[str, int]:
+        """Load cumulative hit/miss counters"""
+        with self.connect() as conn:
+            stats = dict(conn.execute("SELECT name, count FROM pool_stats").fetchall())
+        return {'hits': stats.get('hits', 0), 'misses': stats.get('misses', 0)}
+
+    def get_metrics(self, topics: List[str], content_focus: str) -> Dict[str, Any]:
+        """Pool depth, image age and cumulative hit rate for reporting"""
+        now = time.time()
+        images = [image for topic in topics for image in self.list_images(self.pool_key(topic, content_focus))]
+        stats = self.load_stats()
+        lookups = stats['hits'] + stats['misses']
+
+        return {
+            'pooled_images': len(images),
+            'target_depth': self.depth,
+            'topics_at_depth': sum(1 for topic in topics
+                                   if len(self.list_images(self.pool_key(topic, content_focus))) >= self.depth),
+            'oldest_age_hours': round((now - min(image['created_at'] for image in images)) / 3600, 1) if images else None,
+            'max_age_hours': self.max_age_seconds / 3600,
+            'hits': stats['hits'],
+            'misses': stats['misses'],
+            'hit_rate': round(stats['hits'] / lookups, 3) if lookups else None
+        }
+
+    def fill(self, automation, topics: List[str], max_images: int, max_minutes: Optional[float] = None) -> int:
+        """Render images for topics below the target depth, within an image and time budget"""
+        deadline = time.monotonic() + max_minutes * 60 if max_minutes else None
+        shortfall = self.needed(topics, automation.content_focus)
+        generated = 0
+
+        print(f"🧊 Filling image pool: {sum(shortfall.values())} images short across {len(shortfall)} topics")
+        # Round-robin so every topic gets at least one image before any topic gets a second
+        while shortfall and generated < max_images:
+            for topic in list(shortfall):
+                if generated >= max_images or (deadline and time.monotonic() >= deadline):
+                    return generated
+                if automation.check_call_allowed('openai_images', topic, 'image pool fill'):
+                    return generated
+
+                try:
+                    image_bytes = automation.render_topic_image(topic)
+                    automation.breakers['openai_images'].record_success()
+                except Exception as e:
+                    print(f"❌ Error pre-generating image for {topic}: {e}")
+                    automation.breakers['openai_images'].record_failure()
+                    continue
+
+                self.add(topic, automation.content_focus, image_bytes)
+                generated += 1
+                shortfall[topic] -= 1
+                if shortfall[topic] <= 0:
+                    del shortfall[topic]
+
+        return generated
+
+
+def in_idle_window(idle_hours: Optional[str]) -> bool:
+    """Check the current hour against an idle window such as "1-6" or "22-5" """
+    if not idle_hours:
+        return True
+    start, end = (int(hour) for hour in idle_hours.split('-'))
+    hour = datetime.now().hour
+    return start <= hour < end if start <= end else hour >= start or hour < end
+
+
+def start_background_refill(config_file: str, topics: List[str], max_images: int) -> subprocess.Popen:
+    """Refill the pool for the given topics in a separate process"""
+    command = [sys.executable, os.path.abspath(__file__), "fill", "--config", config_file,
+               "--max-images", str(max_images), "--force"]
+    for topic in topics:
+        command += ["--topic", topic]
+    return subprocess.Popen(command)
+
+
+def main():
+    """Command line entry point for filling and inspecting the pool"""
+    parser = argparse.ArgumentParser(description="TrendForge image pool")
+    parser.add_argument("command", choices=["fill", "status"])
+    parser.add_argument("--config", default="topics.json", help="Topics configuration file")
+    parser.add_argument("--topic", action="append", help="Only fill these topics (default: all configured topics)")
+    parser.add_argument("--max-images", type=int, help="Image budget for this fill")
+    parser.add_argument("--max-minutes", type=float, help="Time budget for this fill")
+    parser.add_argument("--force", action="store_true", help="Ignore the configured idle hours")
+    args = parser.parse_args()
+
+    from content_automation import ContentAutomation
+    automation = ContentAutomation(args.config)
+    pool = automation.image_pool or automation.create_image_pool()
+    pool_settings = automation.config.get('image_pool_settings', {})
+    topics = args.topic or automation.config['topics']
+
+    if args.command == "status":
+        print(json.dumps(pool.get_metrics(topics, automation.content_focus), indent=2))
+        return
+
+    if not args.force and not in_idle_window(pool_settings.get('idle_hours')):
+        print(f"⏸️ Outside idle hours ({pool_settings['idle_hours']}); use --force to fill anyway")
+        return
+
+    max_images = args.max_images or pool_settings.get('fill_budget_images', 10)
+    max_minutes = args.max_minutes or pool_settings.get('fill_budget_minutes')
+    generated = pool.fill(automation, topics, max_images, max_minutes)
+    print(f"✅ Pre-generated {generated} images")
+    print(json.dumps(pool.get_metrics(topics, automation.content_focus), indent=2))
+
+
+if __name__ == "__main__":
+    main()
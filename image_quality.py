@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Deadline-aware Image Quality Tiers
+gpt-image-1 renders at 1024x1024 at the smallest, so the tiers trade quality for
+latency. The top tier is the API's default quality ("auto"); only when the run falls
+behind schedule do images drop to a cheaper tier that still lets the remaining
+posts finish before the deadline, based on the latencies observed so far.
+Images rendered below the top tier can be queued for a re-render at the top tier.
+A re-render gets a new file name and the run's report and exports are pointed at
+it, because report_server.py serves images as immutable.
+
+Usage (e.g. from cron after runs):
+    python image_quality.py rerender [--max-images 10]
+    python image_quality.py status
+"""
+
+import argparse
+import os
+import re
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import List, Dict, Any, Iterator, Optional, Set
+
+from result_export import update_image_references
+
+# The API's default quality, sent by leaving the quality parameter out
+AUTO_TIER = 'auto'
+
+# Starting latency estimates in seconds, replaced by observed latencies as the run goes on
+DEFAULT_EXPECTED_SECONDS = {AUTO_TIER: 60.0, 'high': 60.0, 'medium': 30.0, 'low': 15.0}
+
+# Queued images whose run never wrote a report are given up on after this long
+ORPHAN_SECONDS = 7 * 86400
+
+IMAGE_SRC_PATTERN = re.compile(r'<img src="\.\./(images/[^"]+)"')
+
+
+def find_reports(image_paths: Set[str], since: float, reports_dir: str = "reports") -> Dict[str, str]:
+    """Map image paths to the path stem of the report showing them, checking reports written since a time"""
+    found = {}
+    if not os.path.isdir(reports_dir):
+        return found
+    for entry in os.scandir(reports_dir):
+        if not entry.name.endswith('.html') or entry.stat().st_mtime < since:
+            continue
+        with open(entry.path, 'r', encoding='utf-8', errors='replace') as f:
+            for image_path in IMAGE_SRC_PATTERN.findall(f.read()):
+                if image_path in image_paths:
+                    found[image_path] = entry.path[:-len('.html')]
+    return found
+
+
+def update_report(report_stem: str, old_image_path: str, new_image_path: str, tier: str):
+    """Point a report and its exports at a re-rendered image"""
+    report_file = f"{report_stem}.html"
+    with open(report_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+    content = content.replace(f'src="../{old_image_path}"', f'src="../{new_image_path}"')
+    caption = re.compile(r'(<img src="\.\./' + re.escape(new_image_path) +
+                         r'"[^>]*/></div>\s*<div class="citation-meta">Image quality: )[^<]*(</div>)')
+    content = caption.sub(lambda match: f"{match.group(1)}{tier} (re-rendered){match.group(2)}", content)
+
+    tmp_file = f"{report_file}.{os.getpid()}.tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp_file, report_file)
+
+    for extension in ('.jsonl', '.parquet'):
+        update_image_references(f"{report_stem}{extension}", old_image_path, new_image_path, tier)
+
+
+class ImageTierPolicy:
+    def __init__(self, tiers: Optional[List[str]] = None, expected_seconds: Optional[Dict[str, float]] = None,
+                 post_seconds: float = 30.0, smoothing: float = 0.5):
+        self.tiers = tiers or [AUTO_TIER, 'medium', 'low']
+        self.expected_seconds = {**DEFAULT_EXPECTED_SECONDS, **(expected_seconds or {})}
+        self.post_seconds = post_seconds
+        self.smoothing = smoothing
+
+    def choose(self, remaining: Optional[float], images_left: int = 1) -> str:
+        """Pick the best tier that lets every remaining post and image finish in time"""
+        if remaining is None:
+            return self.tiers[0]
+
+        for tier in self.tiers:
+            # This image plus the post and image of every post still waiting
+            needed = images_left * self.expected_seconds[tier] + (images_left - 1) * self.post_seconds
+            if needed <= remaining:
+                return tier
+        return self.tiers[-1]
+
+    def observe_image(self, tier: str, seconds: float):
+        """Blend an observed render latency into the tier's estimate"""
+        previous = self.expected_seconds.get(tier, seconds)
+        self.expected_seconds[tier] = self.smoothing * seconds + (1 - self.smoothing) * previous
+
+    def observe_post(self, seconds: float):
+        """Blend an observed post generation latency into the estimate"""
+        self.post_seconds = self.smoothing * seconds + (1 - self.smoothing) * self.post_seconds
+
+
+class RerenderQueue:
+    """SQLite queue of images to render again at the top tier, safe for concurrent runs"""
+
+    def __init__(self, db_path: str = "data/image_rerenders.db", reports_dir: str = "reports"):
+        self.db_path = db_path
+        self.reports_dir = reports_dir
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self.create_tables()
+
+    @contextmanager
+    def connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection that commits on success"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def create_tables(self):
+        """Create the queue schema if it does not exist yet"""
+        with self.connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS rerenders (
+                    entry_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    topic TEXT NOT NULL,
+                    content_focus TEXT NOT NULL,
+                    image_path TEXT NOT NULL,
+                    tier TEXT NOT NULL,
+                    queued_at REAL NOT NULL
+                )
+            """)
+
+    def add(self, topic: str, content_focus: str, image_path: str, tier: str, queued_at: Optional[float] = None):
+        """Queue an image for a re-render at the top tier"""
+        with self.connect() as conn:
+            conn.execute(
+                "INSERT INTO rerenders (topic, content_focus, image_path, tier, queued_at) VALUES (?, ?, ?, ?, ?)",
+                (topic, content_focus, image_path, tier, queued_at or time.time())
+            )
+
+    def load(self) -> List[Dict[str, Any]]:
+        """Return the queued re-renders, oldest first"""
+        with self.connect() as conn:
+            return [dict(row) for row in conn.execute("SELECT * FROM rerenders ORDER BY entry_id")]
+
+    def remove(self, entry_id: int) -> bool:
+        """Take an entry off the queue; False if a concurrent pass already took it"""
+        with self.connect() as conn:
+            return conn.execute("DELETE FROM rerenders WHERE entry_id = ?", (entry_id,)).rowcount == 1
+
+    def process(self, automation, quality: str, max_images: Optional[int] = None) -> int:
+        """Re-render queued images at the given quality and point their reports at the new files"""
+        entries = self.load()
+        rendered = 0
+        since = min((entry['queued_at'] for entry in entries), default=time.time()) - 60
+        reports = find_reports({entry['image_path'] for entry in entries}, since, self.reports_dir)
+
+        for entry in entries:
+            if not os.path.exists(entry['image_path']):
+                self.remove(entry['entry_id'])  # The image was deleted, so there is nothing to improve
+                continue
+            report_stem = reports.get(entry['image_path'])
+            if report_stem is None:
+                # The run is still going; wait for its report unless it never wrote one
+                if time.time() - entry['queued_at'] >= ORPHAN_SECONDS:
+                    self.remove(entry['entry_id'])
+                continue
+            if max_images is not None and rendered >= max_images:
+                break
+            if automation.check_call_allowed('openai_images', entry['topic'], 'image re-render'):
+                continue
+            # Claiming by delete means two concurrent passes never render the same image
+            if not self.remove(entry['entry_id']):
+                continue
+
+            try:
+                # The prompt uses the focus of the run that queued the image, not this config's
+                image_bytes = automation.render_topic_image(entry['topic'], quality, entry['content_focus'])
+                automation.breakers['openai_images'].record_success()
+            except Exception as e:
+                print(f"❌ Error re-rendering image for {entry['topic']}: {e}")
+                automation.breakers['openai_images'].record_failure()
+                self.add(entry['topic'], entry['content_focus'], entry['image_path'], entry['tier'], entry['queued_at'])
+                continue
+
+            # A new file name, since clients cache images as immutable and would keep the old one
+            image_path = automation.new_image_filename(entry['topic'])
+            tmp_path = f"{image_path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(image_bytes)
+            os.replace(tmp_path, image_path)
+            update_report(report_stem, entry['image_path'], image_path, quality)
+            os.remove(entry['image_path'])
+            print(f"✨ Re-rendered {entry['image_path']} as {image_path} at {quality} quality (was {entry['tier']})")
+            rendered += 1
+
+        return rendered
+
+def main():
+    """Command line entry point for processing the re-render queue"""
+    parser = argparse.ArgumentParser(description="TrendForge image quality re-renders")
+    parser.add_argument("command", choices=["rerender", "status"])
+    parser.add_argument("--config", default="topics.json", help="Topics configuration file")
+    parser.add_argument("--max-images", type=int, help="Image budget for this pass")
+    args = parser.parse_args()
+
+    from content_automation import ContentAutomation
+    automation = ContentAutomation(args.config)
+    rerender_queue = automation.create_rerender_queue()
+
+    if args.command == "status":
+        entries = rerender_queue.load()
+        print(f"🖼️ {len(entries)} images queued for a re-render at {automation.image_policy.tiers[0]} quality")
+        for entry in entries:
+            print(f"  • {entry['image_path']} ({entry['tier']})")
+        return
+
+    rendered = rerender_queue.process(automation, automation.image_policy.tiers[0], args.max_images)
+    print(f"✅ Re-rendered {rendered} images")
+
+
+if __name__ == "__main__":
+    main()
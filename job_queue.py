@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Durable Local Job Queue for Distributed Content Automation
+SQLite-backed queue shared by one coordinator and any number of workers.
+Workers claim jobs with a lease; jobs held by crashed workers become
+claimable again once their lease expires.
+"""
+
+import json
+import os
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional, Tuple, Iterable, Iterator
+
+
+class JobQueue:
+    PENDING = "pending"
+    LEASED = "leased"
+    DONE = "done"
+    FAILED = "failed"
+
+    def __init__(self, db_path: str = "data/job_queue.db", max_attempts: int = 3):
+        self.db_path = db_path
+        self.max_attempts = max_attempts
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self.create_tables()
+
+    @contextmanager
+    def connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection in autocommit mode; transactions are started explicitly"""
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def create_tables(self):
+        """Create the queue schema if it does not exist yet"""
+        with self.connect() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS runs (
+                    run_id TEXT PRIMARY KEY,
+                    config_file TEXT NOT NULL,
+                    deadline_at REAL,
+                    created_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    run_id TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    topic TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    lease_owner TEXT,
+                    lease_expires REAL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    result TEXT,
+                    error TEXT,
+                    updated_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs (status, lease_expires);
+                -- Also serves paging through a run's jobs in topic order
+                CREATE INDEX IF NOT EXISTS idx_jobs_run_position ON jobs (run_id, kind, position, job_id);
+            """)
+
+    def create_run(self, config_file: str, deadline_minutes: Optional[float] = None) -> str:
+        """Register a new run and return its id"""
+        run_id = new_run_id()
+        now = time.time()
+        deadline_at = now + deadline_minutes * 60 if deadline_minutes else None
+        with self.connect() as conn:
+            conn.execute(
+                "INSERT INTO runs (run_id, config_file, deadline_at, created_at) VALUES (?, ?, ?, ?)",
+                (run_id, self.relative_path(config_file), deadline_at, now)
+            )
+        return run_id
+
+    def get_run(self, run_id: str) -> Dict[str, Any]:
+        """Return the stored run record, with the config path resolved on this host"""
+        with self.connect() as conn:
+            row = conn.execute("SELECT * FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        if row is None:
+            raise ValueError(f"Unknown run: {run_id}")
+        run = dict(row)
+        run['config_file'] = os.path.normpath(os.path.join(self.queue_dir(), run['config_file']))
+        return run
+
+    def queue_dir(self) -> str:
+        """Directory holding the queue database on this host"""
+        return os.path.dirname(os.path.abspath(self.db_path))
+
+    def relative_path(self, path: str) -> str:
+        """Path relative to the queue directory, so hosts can mount shared storage at different paths"""
+        try:
+            return os.path.relpath(os.path.abspath(path), self.queue_dir())
+        except ValueError:
+            # Different drive on Windows; there is no relative path
+            return os.path.abspath(path)
+
+    def enqueue_many(self, run_id: str, jobs: Iterable[Tuple[str, int, str, Dict[str, Any]]],
+                     batch_size: int = 500) -> int:
+        """Add jobs from a (possibly streamed) iterable, one transaction per batch"""
+        queued = 0
+        with self.connect() as conn:
+            batch = []
+            for job in jobs:
+                batch.append(job)
+                if len(batch) >= batch_size:
+                    queued += self._insert_batch(conn, run_id, batch)
+                    batch = []
+            if batch:
+                queued += self._insert_batch(conn, run_id, batch)
+        return queued
+
+    def _insert_batch(self, conn: sqlite3.Connection, run_id: str, jobs: List[Tuple[str, int, str, Dict[str, Any]]]) -> int:
+        # Committing per batch keeps fsyncs rare while letting workers claim jobs between batches
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._insert_jobs(conn, run_id, jobs)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return len(jobs)
+
+    def _insert_jobs(self, conn: sqlite3.Connection, run_id: str, jobs: List[Tuple[str, int, str, Dict[str, Any]]]):
+        now = time.time()
+        conn.executemany(
+            "INSERT INTO jobs (run_id, kind, position, topic, payload, status, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(run_id, kind, position, topic, json.dumps(payload), self.PENDING, now)
+             for kind, position, topic, payload in jobs]
+        )
+
+    def claim(self, worker_id: str, lease_seconds: float) -> Optional[Dict[str, Any]]:
+        """Lease the oldest available job, including jobs whose lease has expired"""
+        now = time.time()
+        with self.connect() as conn:
+            # BEGIN IMMEDIATE takes the write lock so two workers never claim the same job
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Jobs that keep outliving their lease are given up on rather than retried forever
+                conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+                    "WHERE status = ? AND lease_expires < ? AND attempts >= ?",
+                    (self.FAILED, "lease expired on final attempt", now, self.LEASED, now, self.max_attempts)
+                )
+                row = conn.execute(
+                    "SELECT * FROM jobs WHERE status = ? OR (status = ? AND lease_expires < ?) "
+                    "ORDER BY job_id LIMIT 1",
+                    (self.PENDING, self.LEASED, now)
+                ).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+
+                if row['status'] == self.LEASED:
+                    print(f"♻️ Reclaiming {row['kind']} job for {row['topic']} from {row['lease_owner']} (lease expired)")
+
+                conn.execute(
+                    "UPDATE jobs SET status = ?, lease_owner = ?, lease_expires = ?, "
+                    "attempts = attempts + 1, updated_at = ? WHERE job_id = ?",
+                    (self.LEASED, worker_id, now + lease_seconds, now, row['job_id'])
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        job = dict(row)
+        job.update(status=self.LEASED, lease_owner=worker_id, lease_expires=now + lease_seconds,
+                   attempts=row['attempts'] + 1, payload=json.loads(row['payload']))
+        return job
+
+    def extend_lease(self, job_id: int, worker_id: str, lease_seconds: float) -> bool:
+        """Push the lease forward while a long job is still running"""
+        with self.connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires = ?, updated_at = ? "
+                "WHERE job_id = ? AND lease_owner = ? AND status = ?",
+                (time.time() + lease_seconds, time.time(), job_id, worker_id, self.LEASED)
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: int, worker_id: str, result: Dict[str, Any],
+                 follow_up: Optional[List[Tuple[str, int, str, Dict[str, Any]]]] = None) -> bool:
+        """Store a job result and enqueue follow-up jobs in the same transaction"""
+        with self.connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                cursor = conn.execute(
+                    "UPDATE jobs SET status = ?, result = ?, lease_expires = NULL, updated_at = ? "
+                    "WHERE job_id = ? AND lease_owner = ? AND status = ?",
+                    (self.DONE, json.dumps(result), time.time(), job_id, worker_id, self.LEASED)
+                )
+                if cursor.rowcount != 1:
+                    # The lease expired and another worker took the job over
+                    conn.execute("ROLLBACK")
+                    return False
+
+                if follow_up:
+                    run_id = conn.execute("SELECT run_id FROM jobs WHERE job_id = ?", (job_id,)).fetchone()[0]
+                    self._insert_jobs(conn, run_id, follow_up)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return True
+
+    def fail(self, job_id: int, worker_id: str, error: str) -> bool:
+        """Release a failed job for retry, or mark it failed after max_attempts"""
+        with self.connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END, "
+                "error = ?, lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+                "WHERE job_id = ? AND lease_owner = ? AND status = ?",
+                (self.max_attempts, self.FAILED, self.PENDING, error, time.time(),
+                 job_id, worker_id, self.LEASED)
+            )
+        return cursor.rowcount == 1
+
+    def get_counts(self, run_id: Optional[str] = None, kind: Optional[str] = None) -> Dict[str, int]:
+        """Count jobs by status, optionally for one run and job kind"""
+        query = "SELECT status, COUNT(*) FROM jobs WHERE 1 = 1"
+        params = []
+        if run_id:
+            query += " AND run_id = ?"
+            params.append(run_id)
+        if kind:
+            query += " AND kind = ?"
+            params.append(kind)
+        query += " GROUP BY status"
+
+        counts = {status: 0 for status in (self.PENDING, self.LEASED, self.DONE, self.FAILED)}
+        with self.connect() as conn:
+            for status, count in conn.execute(query, params):
+                counts[status] = count
+        return counts
+
+    def get_jobs(self, run_id: str, kind: str) -> List[Dict[str, Any]]:
+        """Return all jobs of one kind for a run, in topic order"""
+        return list(self.iter_jobs(run_id, kind))
+
+    def iter_jobs(self, run_id: str, kind: str, page_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """Yield the jobs of one kind for a run in topic order, one page in memory at a time"""
+        after = (-1, -1)
+        while True:
+            with self.connect() as conn:
+                rows = conn.execute(
+                    "SELECT * FROM jobs WHERE run_id = ? AND kind = ? "
+                    "AND (position > ? OR (position = ? AND job_id > ?)) "
+                    "ORDER BY position, job_id LIMIT ?",
+                    (run_id, kind, after[0], after[0], after[1], page_size)
+                ).fetchall()
+
+            for row in rows:
+                job = dict(row)
+                job['payload'] = json.loads(job['payload'])
+                job['result'] = json.loads(job['result']) if job['result'] else None
+                yield job
+            if len(rows) < page_size:
+                return
+            after = (rows[-1]['position'], rows[-1]['job_id'])
+
+
+def new_run_id() -> str:
+    """Sortable, collision-free run id"""
+    return f"{time.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
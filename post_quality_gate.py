@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Local Quality Gate for Post Drafts
+Checks a draft against the post settings (word count, hashtags, closing question)
+and the research it was written from, so only weak drafts need an expensive model
+"""
+
+import re
+from typing import List, Dict, Any, Tuple
+
+from coverage_store import NUMBER_PATTERN, normalize_number
+
+# A hashtag starts with a letter, so rankings like "#1 trend" or years like "#2025" do not count
+HASHTAG_PATTERN = re.compile(r"(?<!\w)#[^\W\d_]\w*")
+# Matches the "Includes 3-5 relevant hashtags" post instruction
+HASHTAG_RANGE = (3, 5)
+
+
+def parse_word_count_range(word_count_range: str) -> Tuple[int, int]:
+    """Turn "300-500" into (300, 500)"""
+    low, _, high = str(word_count_range).partition('-')
+    return int(low), int(high or low)
+
+
+def extract_data_points(text: str) -> List[str]:
+    """Return the normalized money amounts, percentages and scaled figures in a text"""
+    return list(dict.fromkeys(normalize_number(match) for match in NUMBER_PATTERN.findall(text)))
+
+
+class PostQualityGate:
+    def __init__(self, post_settings: Dict[str, Any], min_data_points: int = 1, word_count_tolerance: float = 0.1):
+        self.word_count_range = parse_word_count_range(post_settings.get('word_count_range', '300-500'))
+        self.include_hashtags = post_settings.get('include_hashtags', True)
+        self.include_questions = post_settings.get('include_questions', True)
+        self.min_data_points = min_data_points
+        self.word_count_tolerance = word_count_tolerance
+
+    def check(self, post: str, research: str) -> Dict[str, Any]:
+        """Return whether a draft passes, and which checks it failed"""
+        hashtags = HASHTAG_PATTERN.findall(post)
+        body = HASHTAG_PATTERN.sub('', post).strip()
+        word_count = len(body.split())
+        failures = []
+
+        low, high = self.word_count_range
+        if not low * (1 - self.word_count_tolerance) <= word_count <= high * (1 + self.word_count_tolerance):
+            failures.append('word_count')
+
+        if self.include_hashtags and not HASHTAG_RANGE[0] <= len(hashtags) <= HASHTAG_RANGE[1]:
+            failures.append('hashtags')
+
+        # The question has to close the post, not just appear somewhere in it
+        paragraphs = [paragraph for paragraph in re.split(r"\n\s*\n", body) if paragraph.strip()]
+        if self.include_questions and not (paragraphs and '?' in paragraphs[-1]):
+            failures.append('question')
+
+        # Thin research has nothing to cite, so only demand what the research can supply
+        research_points = extract_data_points(research)
+        post_points = set(extract_data_points(post))
+        cited = [point for point in research_points if point in post_points]
+        if len(cited) < min(self.min_data_points, len(research_points)):
+            failures.append('data_points')
+
+        return {
+            'passed': not failures,
+            'failures': failures,
+            'word_count': word_count,
+            'hashtags': len(hashtags),
+            'data_points': len(cited)
+        }
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Prompt Templates for Content Automation
+Static instructions, tone and settings come first so every call in a run shares
+an identical prompt prefix; the per-topic content always goes last.
+OpenAI only caches prefixes of 1024+ tokens, which the default post
+instructions (~200 tokens) do not reach on their own.
+"""
+
+from typing import List, Dict, Any
+
+RESEARCH_SYSTEM_TEMPLATE = """You are an expert researcher focused on {content_focus}. Focus only on the most recent and credible information from the past month.
+
+For the topic given by the user, search for the LATEST news, trends, and developments from the past 30 days only.
+Focus on:
+- Recent announcements, breakthroughs, or innovations
+- New research findings or studies
+- Industry updates or changes
+- Market analysis or reports
+- Expert opinions and thought leadership
+- Startup developments or funding news
+
+Please provide:
+1. 3-5 most significant recent developments
+2. Key statistics or data points
+3. Notable companies, people, or organizations involved
+4. Future implications or trends
+
+Only include information from {since} onwards. Ignore older content.
+Content focus area: {content_focus}"""
+
+RESEARCH_USER_TEMPLATE = """Topic: {topic}"""
+
+POST_SYSTEM_TEMPLATE = """You are a content strategist who creates engaging LinkedIn posts for professionals in {content_focus}. Write in a {tone} tone.
+
+The user will send the latest research about a topic. Based on that research, create a professional LinkedIn post ({word_count} words) that:
+
+1. Starts with a compelling hook about the latest development
+2. Explains why this trend matters to professionals in {content_focus}
+3. Includes specific data points or examples from the research
+4. Discusses implications for the future
+5. {closing_instruction}
+6. Uses {tone} language
+7. {hashtag_instruction}
+
+Format: Write as a cohesive LinkedIn post, not bullet points. Make it engaging and shareable."""
+
+POST_USER_TEMPLATE = """Topic: {topic}
+
+Latest research:
+{research}"""
+
+
+def build_research_messages(content_focus: str, since: str, topic: str) -> List[Dict[str, str]]:
+    """Build the Perplexity research messages for a topic"""
+    return [
+        {
+            "role": "system",
+            "content": RESEARCH_SYSTEM_TEMPLATE.format(content_focus=content_focus, since=since)
+        },
+        {
+            "role": "user",
+            "content": RESEARCH_USER_TEMPLATE.format(topic=topic)
+        }
+    ]
+
+
+def build_post_system_prompt(content_focus: str, post_settings: Dict[str, Any]) -> str:
+    """Render the static post instructions shared by every topic in a run"""
+    include_hashtags = post_settings.get('include_hashtags', True)
+    include_questions = post_settings.get('include_questions', True)
+
+    return POST_SYSTEM_TEMPLATE.format(
+        content_focus=content_focus,
+        tone=post_settings.get('tone', 'professional but engaging'),
+        word_count=post_settings.get('word_count_range', '300-500'),
+        closing_instruction=('Ends with a thought-provoking question to encourage engagement'
+                             if include_questions else 'Ends with a strong call-to-action or insight'),
+        hashtag_instruction='Includes 3-5 relevant hashtags' if include_hashtags else 'No hashtags needed'
+    )
+
+
+def build_post_messages(content_focus: str, post_settings: Dict[str, Any],
+                        topic: str, research: str) -> List[Dict[str, str]]:
+    """Build the OpenAI post generation messages for a topic"""
+    return [
+        {
+            "role": "developer",
+            "content": build_post_system_prompt(content_focus, post_settings)
+        },
+        {
+            "role": "user",
+            "content": POST_USER_TEMPLATE.format(topic=topic, research=research)
+        }
+    ]
+
+
+VARIANT_SYSTEM_TEMPLATE = """You are a content strategist who creates engaging LinkedIn posts for professionals in {content_focus}.
+
+The user will send the latest research about a topic. Based on that research, write {count} different drafts of a professional LinkedIn post for A/B testing. Every draft:
+
+1. Starts with a compelling hook about the latest development
+2. Explains why this trend matters to its audience
+3. Includes specific data points or examples from the research
+4. Discusses implications for the future
+5. {closing_instruction}
+6. {hashtag_instruction}
+7. Is written as a cohesive LinkedIn post, not bullet points
+
+Write exactly one draft per specification below, in this order:
+{variant_specs}
+
+Respond with a JSON object of the form {{"variants": [{{"label": "<specification label>", "post": "<post text>"}}]}}."""
+
+VARIANT_SPEC_TEMPLATE = """- {label}: {word_count_range} words, {tone} tone, written for {audience}"""
+
+
+def build_variant_messages(content_focus: str, post_settings: Dict[str, Any], variants: List[Dict[str, Any]],
+                           topic: str, research: str) -> List[Dict[str, str]]:
+    """Build a single request that asks for several differently-parameterized drafts"""
+    include_hashtags = post_settings.get('include_hashtags', True)
+    include_questions = post_settings.get('include_questions', True)
+    variant_specs = "\n".join(
+        VARIANT_SPEC_TEMPLATE.format(
+            label=variant['label'],
+            word_count_range=variant.get('word_count_range', post_settings.get('word_count_range', '300-500')),
+            tone=variant.get('tone', post_settings.get('tone', 'professional but engaging')),
+            audience=variant.get('audience', f'professionals in {content_focus}')
+        )
+        for variant in variants
+    )
+
+    return [
+        {
+            "role": "developer",
+            "content": VARIANT_SYSTEM_TEMPLATE.format(
+                content_focus=content_focus,
+                count=len(variants),
+                closing_instruction=('Ends with a thought-provoking question to encourage engagement'
+                                     if include_questions else 'Ends with a strong call-to-action or insight'),
+                hashtag_instruction='Includes 3-5 relevant hashtags' if include_hashtags else 'No hashtags needed',
+                variant_specs=variant_specs
+            )
+        },
+        {
+            "role": "user",
+            "content": POST_USER_TEMPLATE.format(topic=topic, research=research)
+        }
+    ]
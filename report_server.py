@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Local Report Server
+Serves reports/ and images/ over HTTP so reviewers can share a link instead of
+copying whole directories of images around
+
+- HTML is gzip (or brotli, when installed) compressed and revalidated with strong ETags
+- Images are served with long-lived immutable cache headers and HTTP range support
+- The index of recent runs only re-reads reports that changed since the last request
+
+Usage:
+    python report_server.py [--host 127.0.0.1] [--port 8000]
+"""
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import html
+import mimetypes
+import os
+import re
+from datetime import datetime
+from email.utils import formatdate
+from typing import Dict, Any, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+SERVED_DIRECTORIES = ('reports', 'images')
+COMPRESSIBLE_TYPES = ('text/html', 'text/plain', 'application/json', 'application/x-ndjson')
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "no-cache"
+CHUNK_SIZE = 64 * 1024
+MAX_CACHED_BODY = 8 * 1024 * 1024
+# Caps on the request head, so a client can't make the server buffer it without bound
+MAX_LINE_SIZE = 8 * 1024
+MAX_HEADERS = 100
+
+STATUS_TEXT = {
+    200: "OK", 206: "Partial Content", 304: "Not Modified", 400: "Bad Request",
+    404: "Not Found", 405: "Method Not Allowed", 416: "Range Not Satisfiable",
+    431: "Request Header Fields Too Large"
+}
+
+mimetypes.add_type('application/x-ndjson', '.jsonl')
+
+
+class ReportServer:
+    def __init__(self, root: str = ".", recent_runs: int = 50):
+        self.root = os.path.abspath(root)
+        self.recent_runs = recent_runs
+        # path -> (mtime_ns, size, strong ETag), so large images are hashed once
+        self.etags: Dict[str, Tuple[int, int, str]] = {}
+        # (path, encoding) -> (mtime_ns, compressed body)
+        self.compressed: Dict[Tuple[str, str], Tuple[int, bytes]] = {}
+        # report name -> (mtime_ns, summary) for the index page
+        self.report_summaries: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+
+    def resolve_path(self, url_path: str) -> Optional[str]:
+        """Map a URL path to a file inside reports/ or images/, refusing anything else"""
+        relative = unquote(url_path).lstrip('/')
+        if relative.split('/', 1)[0] not in SERVED_DIRECTORIES:
+            return None
+        full_path = os.path.realpath(os.path.join(self.root, relative))
+        allowed = [os.path.realpath(os.path.join(self.root, directory)) for directory in SERVED_DIRECTORIES]
+        if not any(full_path.startswith(directory + os.sep) for directory in allowed):
+            return None
+        return full_path if os.path.isfile(full_path) else None
+
+    def get_etag(self, path: str, stat: os.stat_result) -> str:
+        """Strong ETag from the file content, cached until the file changes"""
+        cached = self.etags.get(path)
+        if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+        etag = f'"{digest.hexdigest()[:32]}"'
+        self.etags[path] = (stat.st_mtime_ns, stat.st_size, etag)
+        return etag
+
+    def get_compressed(self, path: str, stat: os.stat_result, encoding: str) -> bytes:
+        """Compressed file body, cached until the file changes"""
+        cached = self.compressed.get((path, encoding))
+        if cached and cached[0] == stat.st_mtime_ns:
+            return cached[1]
+
+        with open(path, 'rb') as f:
+            body = f.read()
+        body = brotli.compress(body) if encoding == 'br' else gzip.compress(body, compresslevel=6)
+        if len(body) <= MAX_CACHED_BODY:
+            self.compressed[(path, encoding)] = (stat.st_mtime_ns, body)
+        return body
+
+    @staticmethod
+    def choose_encoding(accept_encoding: str) -> Optional[str]:
+        """Pick brotli or gzip from the Accept-Encoding header"""
+        accepted = {part.split(';')[0].strip() for part in accept_encoding.lower().split(',')}
+        if brotli is not None and 'br' in accepted:
+            return 'br'
+        if 'gzip' in accepted:
+            return 'gzip'
+        return None
+
+    @staticmethod
+    def parse_range(range_header: str, size: int) -> Optional[Tuple[int, int]]:
+        """Parse a single bytes range; returns (start, end) inclusive or None if unsatisfiable"""
+        match = re.fullmatch(r"bytes=(\d*)-(\d*)", range_header.strip())
+        if not match or (not match.group(1) and not match.group(2)):
+            return None
+        if not match.group(1):
+            # Suffix range: the last N bytes
+            length = int(match.group(2))
+            if length == 0:
+                return None
+            return max(0, size - length), size - 1
+        start = int(match.group(1))
+        end = int(match.group(2)) if match.group(2) else size - 1
+        if start >= size or end < start:
+            return None
+        return start, min(end, size - 1)
+
+    def summarize_report(self, path: str, mtime_ns: int) -> Dict[str, Any]:
+        """Extract the index details of a report, re-reading it only when it changed"""
+        name = os.path.basename(path)
+        cached = self.report_summaries.get(name)
+        if cached and cached[0] == mtime_ns:
+            return cached[1]
+
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            content = f.read()
+        focus = re.search(r"<strong>Content Focus:</strong>\s*(.*?)\s*</div>", content, re.DOTALL)
+        summary = {
+            'name': name,
+            'content_focus': focus.group(1).strip() if focus else "",
+            'posts': content.count('class="post-card"'),
+            'partial': 'class="skipped"' in content,
+            'modified': datetime.fromtimestamp(mtime_ns / 1e9).strftime('%Y-%m-%d %H:%M')
+        }
+        self.report_summaries[name] = (mtime_ns, summary)
+        return summary
+
+    def render_index(self) -> bytes:
+        """Live index of the most recent runs"""
+        reports_dir = os.path.join(self.root, 'reports')
+        entries = []
+        if os.path.isdir(reports_dir):
+            entries = [entry for entry in os.scandir(reports_dir) if entry.name.endswith('.html')]
+        entries.sort(key=lambda entry: entry.stat().st_mtime_ns, reverse=True)
+
+        rows = ""
+        for entry in entries[:self.recent_runs]:
+            summary = self.summarize_report(entry.path, entry.stat().st_mtime_ns)
+            stem = summary['name'][:-len('.html')]
+            export_link = (f' · <a href="/reports/{stem}.jsonl">jsonl</a>'
+                           if os.path.exists(os.path.join(reports_dir, f"{stem}.jsonl")) else "")
+            rows += f"""
+                <tr>
+                    <td><a href="/reports/{html.escape(summary['name'])}">{summary['modified']}</a>{export_link}</td>
+                    <td>{html.escape(summary['content_focus'])}</td>
+                    <td>{summary['posts']}</td>
+                    <td>{'⚠️ partial' if summary['partial'] else '✅'}</td>
+                </tr>"""
+
+        return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <title>TrendForge Reports</title>
+    <style>
+        body {{ font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; margin: 40px; background: #f8f9fa; }}
+        table {{ border-collapse: collapse; width: 100%; max-width: 1000px; background: white; }}
+        th, td {{ padding: 10px 15px; border-bottom: 1px solid #e0e0e0; text-align: left; }}
+        th {{ background: #007acc; color: white; }}
+        a {{ color: #007acc; }}
+    </style>
+</head>
+<body>
+    <h1>🚀 TrendForge Reports</h1>
+    <table>
+        <tr><th>Run</th><th>Content Focus</th><th>Posts</th><th>Status</th></tr>{rows}
+    </table>
+</body>
+</html>""".encode('utf-8')
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve requests on one connection until the client closes it"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                header_count = 0
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    header_count += 1
+                    if header_count > MAX_HEADERS:
+                        raise ValueError(f"More than {MAX_HEADERS} header lines")
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                parts = request_line.decode('latin-1').split()
+                if len(parts) != 3:
+                    await self.send(writer, 400, {}, b"Bad Request")
+                    break
+
+                method, target, version = parts
+                keep_alive = version == "HTTP/1.1" and headers.get('connection', '').lower() != 'close'
+                await self.handle_request(writer, method, urlsplit(target).path, headers, keep_alive)
+                if not keep_alive:
+                    break
+        except ValueError:
+            # readline raises ValueError for a line longer than MAX_LINE_SIZE
+            try:
+                await self.send(writer, 431, {'Connection': 'close'}, b"Request Header Fields Too Large")
+            except (ConnectionResetError, BrokenPipeError):
+                pass
+        except (ConnectionResetError, BrokenPipeError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def handle_request(self, writer: asyncio.StreamWriter, method: str, path: str,
+                             headers: Dict[str, str], keep_alive: bool):
+        """Route a single request"""
+        connection = {'Connection': 'keep-alive' if keep_alive else 'close'}
+        head_only = method == 'HEAD'
+        if method not in ('GET', 'HEAD'):
+            await self.send(writer, 405, {**connection, 'Allow': 'GET, HEAD'}, b"Method Not Allowed")
+            return
+
+        loop = asyncio.get_running_loop()
+        if path in ('/', '/index.html'):
+            # Scanning and re-reading changed reports is file I/O, so it runs off the event loop too
+            body = await loop.run_in_executor(None, self.render_index)
+            response_headers = {**connection, 'Content-Type': 'text/html; charset=utf-8',
+                                'Cache-Control': REVALIDATE_CACHE}
+            encoding = self.choose_encoding(headers.get('accept-encoding', ''))
+            if encoding == 'gzip':
+                body = await loop.run_in_executor(None, gzip.compress, body)
+            elif encoding == 'br':
+                body = await loop.run_in_executor(None, brotli.compress, body)
+            if encoding:
+                response_headers.update({'Content-Encoding': encoding, 'Vary': 'Accept-Encoding'})
+            await self.send(writer, 200, response_headers, body, head_only)
+            return
+
+        file_path = self.resolve_path(path)
+        if file_path is None:
+            await self.send(writer, 404, connection, b"Not Found", head_only)
+            return
+
+        stat = os.stat(file_path)
+        content_type = mimetypes.guess_type(file_path)[0] or 'application/octet-stream'
+        is_image = path.startswith('/images/')
+        # Hashing and compressing run off the event loop so one large file never stalls other clients
+        etag = await loop.run_in_executor(None, self.get_etag, file_path, stat)
+        response_headers = {
+            **connection,
+            'Content-Type': f"{content_type}; charset=utf-8" if content_type.startswith('text/') else content_type,
+            'Cache-Control': IMMUTABLE_CACHE if is_image else REVALIDATE_CACHE,
+            'Last-Modified': formatdate(stat.st_mtime, usegmt=True),
+            'Accept-Ranges': 'bytes'
+        }
+
+        # Compressed variants get their own strong ETag
+        encoding = None
+        if content_type in COMPRESSIBLE_TYPES and 'range' not in headers:
+            encoding = self.choose_encoding(headers.get('accept-encoding', ''))
+            response_headers['Vary'] = 'Accept-Encoding'
+        if encoding:
+            etag = f'{etag[:-1]}-{encoding}"'
+        response_headers['ETag'] = etag
+
+        if_none_match = headers.get('if-none-match', '')
+        if etag in [tag.strip() for tag in if_none_match.split(',')] or if_none_match.strip() == '*':
+            await self.send(writer, 304, response_headers, b"", head_only=True)
+            return
+
+        if encoding:
+            body = await loop.run_in_executor(None, self.get_compressed, file_path, stat, encoding)
+            response_headers['Content-Encoding'] = encoding
+            await self.send(writer, 200, response_headers, body, head_only)
+            return
+
+        start, end, status = 0, stat.st_size - 1, 200
+        if 'range' in headers and headers.get('if-range', etag) == etag:
+            byte_range = self.parse_range(headers['range'], stat.st_size)
+            if byte_range is None:
+                await self.send(writer, 416, {**connection, 'Content-Range': f"bytes */{stat.st_size}"}, b"", head_only)
+                return
+            start, end = byte_range
+            status = 206
+            response_headers['Content-Range'] = f"bytes {start}-{end}/{stat.st_size}"
+
+        await self.send_file(writer, status, response_headers, file_path, start, end, head_only)
+
+    async def send(self, writer: asyncio.StreamWriter, status: int, headers: Dict[str, str],
+                   body: bytes, head_only: bool = False):
+        """Write a complete in-memory response"""
+        if status != 304:
+            # A 304 may only carry the Content-Length of the full 200 response, so it carries none
+            headers = {**headers, 'Content-Length': str(len(body))}
+        writer.write(self.status_block(status, headers))
+        if not head_only:
+            writer.write(body)
+        await writer.drain()
+
+    async def send_file(self, writer: asyncio.StreamWriter, status: int, headers: Dict[str, str],
+                        path: str, start: int, end: int, head_only: bool):
+        """Stream part of a file in chunks so large images never sit in memory"""
+        length = max(0, end - start + 1)
+        writer.write(self.status_block(status, {**headers, 'Content-Length': str(length)}))
+        if not head_only and length:
+            # Disk reads run off the event loop, like hashing and compressing
+            loop = asyncio.get_running_loop()
+            f = await loop.run_in_executor(None, open, path, 'rb')
+            try:
+                await loop.run_in_executor(None, f.seek, start)
+                remaining = length
+                while remaining > 0:
+                    chunk = await loop.run_in_executor(None, f.read, min(CHUNK_SIZE, remaining))
+                    if not chunk:
+                        break
+                    writer.write(chunk)
+                    remaining -= len(chunk)
+                    await writer.drain()
+            finally:
+                f.close()
+        await writer.drain()
+
+    @staticmethod
+    def status_block(status: int, headers: Dict[str, str]) -> bytes:
+        lines = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}",
+                 f"Date: {formatdate(usegmt=True)}",
+                 "Server: TrendForge"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        return ("\r\n".join(lines) + "\r\n\r\n").encode('latin-1')
+
+    async def start(self, host: str, port: int) -> asyncio.AbstractServer:
+        """Start listening; port 0 picks a free port"""
+        return await asyncio.start_server(self.handle_connection, host, port, limit=MAX_LINE_SIZE)
+
+    async def serve(self, host: str, port: int):
+        """Run the server until interrupted"""
+        server = await self.start(host, port)
+        print(f"📡 Serving TrendForge reports at http://{host}:{port}/")
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Serve TrendForge reports and images")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on")
+    parser.add_argument("--root", default=".", help="Directory containing reports/ and images/")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(ReportServer(args.root).serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("\n👋 Report server stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Bulk Export of Run Results
+Streams each generated post to JSONL as it is produced, with an optional
+Parquet copy for columnar bulk loading (requires pyarrow)
+"""
+
+import json
+import os
+from typing import List, Dict, Any, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+
+def build_record(post_data: Dict[str, Any], content_focus: str) -> Dict[str, Any]:
+    """Flatten a generated post into an export record"""
+    timings = post_data.get('timings', {})
+    research_usage = post_data.get('research_usage', {})
+    post_usage = post_data.get('usage', {})
+    cascade = post_data.get('cascade', {})
+    return {
+        'topic': post_data['topic'],
+        'content_focus': content_focus,
+        'post_content': post_data['post_content'],
+        'research': post_data.get('source_data', ''),
+        'citations': list(post_data.get('citations', [])),
+        'variants': [
+            {'label': variant['label'], 'post_content': variant['post_content']}
+            for variant in post_data.get('variants', [])
+        ],
+        'image_path': post_data.get('image_path', ''),
+        'image_source': post_data.get('image_source', ''),
+        'image_tier': post_data.get('image_tier', ''),
+        'timestamp': post_data['timestamp'],
+        'research_seconds': timings.get('research'),
+        'post_seconds': timings.get('post'),
+        'post_model': post_data.get('model', ''),
+        'post_escalated': cascade.get('escalated'),
+        'draft_seconds': cascade.get('draft_seconds'),
+        'image_seconds': timings.get('image'),
+        'research_prompt_tokens': research_usage.get('prompt_tokens', 0),
+        'research_completion_tokens': research_usage.get('completion_tokens', 0),
+        'post_prompt_tokens': post_usage.get('prompt_tokens', 0),
+        'post_completion_tokens': post_usage.get('completion_tokens', 0),
+        'post_cached_tokens': post_usage.get('cached_tokens', 0)
+    }
+
+
+class ResultExporter:
+    """Writes one record per post without holding the whole run in memory"""
+
+    PARQUET_BATCH_SIZE = 500
+
+    def __init__(self, jsonl_path: str, parquet_path: Optional[str] = None, content_focus: str = ""):
+        self.jsonl_path = jsonl_path
+        self.parquet_path = parquet_path
+        self.content_focus = content_focus
+        self.records_written = 0
+
+        if parquet_path and pa is None:
+            print("⚠️ pyarrow is not installed; skipping Parquet export (pip install pyarrow)")
+            self.parquet_path = None
+
+        os.makedirs(os.path.dirname(jsonl_path) or '.', exist_ok=True)
+        self.jsonl_file = open(jsonl_path, 'w', encoding='utf-8')
+        self.parquet_writer = None
+        self.parquet_batch: List[Dict[str, Any]] = []
+
+    def write_post(self, post_data: Dict[str, Any]):
+        """Append a single post to the export files"""
+        record = build_record(post_data, self.content_focus)
+        self.jsonl_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.jsonl_file.flush()
+        self.records_written += 1
+
+        if self.parquet_path:
+            self.parquet_batch.append(record)
+            if len(self.parquet_batch) >= self.PARQUET_BATCH_SIZE:
+                self._flush_parquet()
+
+    def _flush_parquet(self):
+        if not self.parquet_batch:
+            return
+        table = pa.Table.from_pylist(self.parquet_batch, schema=self._parquet_schema())
+        if self.parquet_writer is None:
+            self.parquet_writer = pq.ParquetWriter(self.parquet_path, table.schema)
+        self.parquet_writer.write_table(table)
+        self.parquet_batch = []
+
+    @staticmethod
+    def _parquet_schema():
+        return pa.schema([
+            ('topic', pa.string()),
+            ('content_focus', pa.string()),
+            ('post_content', pa.string()),
+            ('research', pa.string()),
+            ('citations', pa.list_(pa.string())),
+            ('variants', pa.list_(pa.struct([('label', pa.string()), ('post_content', pa.string())]))),
+            ('image_path', pa.string()),
+            ('image_source', pa.string()),
+            ('image_tier', pa.string()),
+            ('timestamp', pa.string()),
+            ('research_seconds', pa.float64()),
+            ('post_seconds', pa.float64()),
+            ('post_model', pa.string()),
+            ('post_escalated', pa.bool_()),
+            ('draft_seconds', pa.float64()),
+            ('image_seconds', pa.float64()),
+            ('research_prompt_tokens', pa.int64()),
+            ('research_completion_tokens', pa.int64()),
+            ('post_prompt_tokens', pa.int64()),
+            ('post_completion_tokens', pa.int64()),
+            ('post_cached_tokens', pa.int64())
+        ])
+
+    def close(self):
+        """Flush remaining rows and close the export files"""
+        self.jsonl_file.close()
+        if self.parquet_path:
+            self._flush_parquet()
+            if self.parquet_writer is not None:
+                self.parquet_writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def update_image_references(export_path: str, old_image_path: str, new_image_path: str, image_tier: str) -> bool:
+    """Point the record of a re-rendered image at its new file and tier; False if nothing changed"""
+    if export_path.endswith('.parquet'):
+        if pq is None or not os.path.exists(export_path):
+            return False
+        table = pq.read_table(export_path)
+        records = table.to_pylist()
+    else:
+        try:
+            with open(export_path, 'r', encoding='utf-8') as f:
+                records = [json.loads(line) for line in f if line.strip()]
+        except FileNotFoundError:
+            return False
+
+    changed = False
+    for record in records:
+        if record.get('image_path') == old_image_path:
+            record.update(image_path=new_image_path, image_tier=image_tier)
+            changed = True
+    if not changed:
+        return False
+
+    # Replace the export atomically so readers never see a half-written file
+    tmp_path = f"{export_path}.{os.getpid()}.tmp"
+    if export_path.endswith('.parquet'):
+        pq.write_table(pa.Table.from_pylist(records, schema=table.schema), tmp_path)
+    else:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    os.replace(tmp_path, export_path)
+    return True
@@ -6,10 +6,14 @@ Just double-click this file or run: python run_automation.py
 Repository: https://github.com/buzagloidan/TrendForge
 """
 
+import argparse
 import sys
 import os
 from pathlib import Path
 
+from topic_sources import add_source_arguments, topic_stream_from_args
+from transport import create_transport
+
 def check_requirements():
     """Check if all requirements are met"""
     try:
@@ -49,29 +53,49 @@ def check_env_file():
     print("✅ API keys are configured")
     return True
 
+def wait_for_enter(message):
+    """Keep the window open on double-click runs; stdin may already be consumed by --topics-source -"""
+    try:
+        input(message)
+    except EOFError:
+        pass
+
+def parse_args():
+    """Parse optional launcher flags; double-click runs use the defaults"""
+    parser = argparse.ArgumentParser(description="TrendForge launcher")
+    add_source_arguments(parser)
+    parser.add_argument("--record", metavar="CASSETTE", help="Record every API call to a cassette (e.g. data/run.jsonl.gz)")
+    parser.add_argument("--replay", metavar="CASSETTE", help="Serve API calls from a recorded cassette, without network or API keys")
+    parser.add_argument("--replay-timing", type=float, nargs="?", const=1.0, default=0.0, metavar="SCALE",
+                        help="Replay with the recorded call timing (optionally scaled, e.g. 0.5 for twice as fast)")
+    return parser.parse_args()
+
 def main():
     """Main launcher function"""
+    args = parse_args()
     print("🚀 TrendForge Launcher")
     print("=" * 50)
     
     # Check requirements
     if not check_requirements():
-        input("Press Enter to exit...")
+        wait_for_enter("Press Enter to exit...")
         sys.exit(1)
     
-    # Check .env file
-    if not check_env_file():
-        input("Press Enter to exit...")
+    # Check .env file (replays need no API keys)
+    if not args.replay and not check_env_file():
+        wait_for_enter("Press Enter to exit...")
         sys.exit(1)
     
     # All checks passed, run the automation
     print("\n🚀 Starting content automation...")
     print("This will take several minutes to complete.\n")
     
+    transport = None
     try:
         from content_automation import ContentAutomation
-        automation = ContentAutomation()
-        automation.run_automation()
+        transport = create_transport(args.record, args.replay, args.replay_timing)
+        automation = ContentAutomation(transport=transport)
+        automation.run_automation(topic_stream=topic_stream_from_args(args, automation.config))
         
         print("\n" + "=" * 50)
         print("🎉 AUTOMATION COMPLETED SUCCESSFULLY!")
@@ -82,7 +106,17 @@ def main():
         print(f"\n❌ Error running automation: {e}")
         print("Please check your API keys and internet connection")
     
-    input("\nPress Enter to exit...")
+    finally:
+        if transport:
+            transport.close()
+            stats = transport.get_stats()
+            if stats['mode'] == "record":
+                print(f"🎞️ Recorded {sum(stats['recorded'].values())} API calls to {stats['cassette']}")
+            elif stats['mode'] == "replay":
+                print(f"🎞️ Replayed {stats['exact'] + stats['sequential']} API calls from {stats['cassette']} "
+                      f"({stats['exact']} exact matches, {stats['sequential']} by call order, {stats['missed']} missing)")
+    
+    wait_for_enter("\nPress Enter to exit...")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Run Budget and Circuit Breakers for Content Automation
+Keeps a whole run inside a deadline and fails fast when an API provider is degraded
+"""
+
+import time
+from typing import Dict, Any, Optional
+
+# requests rejects a zero timeout, so a call started right at the deadline still gets this long
+MIN_CALL_TIMEOUT_SECONDS = 1.0
+
+
+class RunBudget:
+    """Tracks the overall run deadline and hands out per-call timeouts"""
+
+    def __init__(self, deadline_seconds: Optional[float] = None, request_timeout: float = 120.0,
+                 sleep_scale: float = 1.0):
+        self.deadline_seconds = deadline_seconds
+        self.request_timeout = request_timeout
+        self.sleep_scale = sleep_scale  # Replays scale or skip rate-limit delays along with call latency
+        self.started_at = time.monotonic()
+
+    def elapsed(self) -> float:
+        """Seconds since the run started"""
+        return time.monotonic() - self.started_at
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left before the deadline, or None when the run is unbounded"""
+        if self.deadline_seconds is None:
+            return None
+        return max(0.0, self.deadline_seconds - self.elapsed())
+
+    def expired(self) -> bool:
+        """True once the run deadline has passed"""
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    def timeout_for(self, default: Optional[float] = None) -> float:
+        """Timeout for the next API call, capped by the time left in the run"""
+        timeout = default if default is not None else self.request_timeout
+        remaining = self.remaining()
+        if remaining is not None:
+            timeout = max(min(timeout, remaining), min(timeout, MIN_CALL_TIMEOUT_SECONDS))
+        return timeout
+
+    def sleep(self, seconds: float):
+        """Rate-limit delay that never sleeps past the deadline"""
+        seconds *= self.sleep_scale
+        remaining = self.remaining()
+        if remaining is not None:
+            seconds = min(seconds, remaining)
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return budget usage for reporting"""
+        return {
+            'deadline_seconds': self.deadline_seconds,
+            'elapsed_seconds': round(self.elapsed(), 1),
+            'remaining_seconds': None if self.remaining() is None else round(self.remaining(), 1),
+            'expired': self.expired()
+        }
+
+
+class CircuitBreaker:
+    """Per-provider breaker that opens after consecutive failures"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, name: str, failure_threshold: int = 3, cooldown_seconds: float = 120.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.total_failures = 0
+        self.rejected_calls = 0
+        self.opened_at = None
+
+    def allow(self) -> bool:
+        """Return True if a call to this provider may be attempted"""
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at >= self.cooldown_seconds:
+                # Let a single trial call through to probe the provider
+                self.state = self.HALF_OPEN
+                return True
+            self.rejected_calls += 1
+            return False
+        return True
+
+    def retry_after(self) -> float:
+        """Seconds until an open breaker lets a trial call through"""
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self.cooldown_seconds - (time.monotonic() - self.opened_at))
+
+    def record_success(self):
+        """Close the breaker after a successful call"""
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+
+    def record_failure(self):
+        """Count a failed call and open the breaker when the threshold is reached"""
+        self.consecutive_failures += 1
+        self.total_failures += 1
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                print(f"⚡ Circuit breaker opened for {self.name} after {self.consecutive_failures} consecutive failures")
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return breaker state for reporting"""
+        return {
+            'state': self.state,
+            'consecutive_failures': self.consecutive_failures,
+            'total_failures': self.total_failures,
+            'rejected_calls': self.rejected_calls
+        }
@@ -51,6 +51,7 @@ def create_directories():
     print("📁 Creating directories...")
     os.makedirs('images', exist_ok=True)
     os.makedirs('reports', exist_ok=True)
+    os.makedirs('data', exist_ok=True)
     print("✅ Directories created!")
 
 def main():
@@ -0,0 +1,115 @@
+"""Citation enrichment against a local HTTP fixture server"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from citation_enricher import CitationEnricher
+
+UTF8_PAGE = """<html><head>
+<meta charset="utf-8">
+<meta property="og:title" content="Café funding in Zürich">
+<meta property="og:site_name" content="Fixture News">
+<meta property="article:published_time" content="2026-10-01T09:00:00Z">
+<title>Fallback title</title>
+</head><body>Article</body></html>""".encode('utf-8')
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append(self.path)
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        try:
+            if self.path == '/blocked':
+                self.send_response(403)
+                self.end_headers()
+                return
+            if self.path.startswith('/slow/'):
+                time.sleep(0.2)
+            # No charset in the header, like many news sites
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html')
+            self.send_header('Content-Length', str(len(UTF8_PAGE)))
+            self.end_headers()
+            self.wfile.write(UTF8_PAGE)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+    httpd.lock = threading.Lock()
+    httpd.requests = []
+    httpd.active = 0
+    httpd.max_active = 0
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    httpd.base_url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def enricher(tmp_path):
+    return CitationEnricher(cache_file=str(tmp_path / "citation_cache.json"), concurrency=3, timeout=5)
+
+
+def test_parses_metadata_using_meta_charset(server, enricher):
+    url = f"{server.base_url}/article"
+    metadata = enricher.enrich([url])[url]
+
+    assert metadata['title'] == "Café funding in Zürich"
+    assert metadata['publisher'] == "Fixture News"
+    assert metadata['published'] == "2026-10-01T09:00:00Z"
+
+
+def test_cached_metadata_is_reused_until_the_ttl_expires(server, enricher):
+    url = f"{server.base_url}/article"
+    enricher.enrich([url])
+    enricher.enrich([url])
+    assert server.requests == ['/article']
+
+    enricher.cache[url]['fetched_at'] -= enricher.ttl_seconds + 1
+    enricher.enrich([url])
+    assert server.requests == ['/article', '/article']
+
+
+def test_failures_are_cached_with_a_shorter_ttl(server, enricher):
+    url = f"{server.base_url}/blocked"
+    assert enricher.enrich([url]) == {}
+    assert enricher.enrich([url]) == {}
+    assert server.requests == ['/blocked']
+    assert enricher.stats['cached_failures'] == 1
+
+    enricher.cache[url]['fetched_at'] -= enricher.failure_ttl_seconds + 1
+    enricher.enrich([url])
+    assert server.requests == ['/blocked', '/blocked']
+
+
+def test_cache_survives_across_runs(server, enricher):
+    url = f"{server.base_url}/article"
+    enricher.enrich([url])
+
+    next_run = CitationEnricher(cache_file=enricher.cache_file)
+    assert next_run.enrich([url])[url]['title'] == "Café funding in Zürich"
+    assert server.requests == ['/article']
+
+
+def test_concurrent_fetches_are_bounded(server, enricher):
+    urls = [f"{server.base_url}/slow/{i}" for i in range(9)]
+    metadata = enricher.enrich(urls)
+
+    assert len(metadata) == 9
+    assert server.max_active <= enricher.concurrency
+    assert server.max_active > 1
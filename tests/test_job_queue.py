@@ -0,0 +1,62 @@
+"""Lease handling of the SQLite job queue"""
+
+import time
+
+import pytest
+
+from job_queue import JobQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(str(tmp_path / "job_queue.db"), max_attempts=2)
+
+
+@pytest.fixture
+def run_id(queue):
+    run_id = queue.create_run("topics.json")
+    queue.enqueue_many(run_id, [("research", 0, "AI", {})])
+    return run_id
+
+
+def expire_leases(queue):
+    with queue.connect() as conn:
+        conn.execute("UPDATE jobs SET lease_expires = ?", (time.time() - 1,))
+
+
+def test_claim_reclaims_an_expired_lease(queue, run_id):
+    job = queue.claim("worker-a", lease_seconds=60)
+    assert queue.claim("worker-b", lease_seconds=60) is None
+
+    expire_leases(queue)
+    reclaimed = queue.claim("worker-b", lease_seconds=60)
+
+    assert reclaimed['job_id'] == job['job_id']
+    assert reclaimed['lease_owner'] == "worker-b"
+    assert reclaimed['attempts'] == 2
+
+
+def test_claim_fails_a_job_whose_lease_expires_on_the_final_attempt(queue, run_id):
+    queue.claim("worker-a", lease_seconds=60)
+    expire_leases(queue)
+    queue.claim("worker-b", lease_seconds=60)
+    expire_leases(queue)
+
+    assert queue.claim("worker-c", lease_seconds=60) is None
+    job = queue.get_jobs(run_id, "research")[0]
+    assert job['status'] == JobQueue.FAILED
+    assert job['error'] == "lease expired on final attempt"
+
+
+def test_complete_rejects_a_stale_lease_owner(queue, run_id):
+    job = queue.claim("worker-a", lease_seconds=60)
+    expire_leases(queue)
+    queue.claim("worker-b", lease_seconds=60)
+
+    follow_up = [("post", 0, "AI", {})]
+    assert not queue.complete(job['job_id'], "worker-a", {'content': "stale"}, follow_up)
+    assert queue.get_jobs(run_id, "post") == []
+
+    assert queue.complete(job['job_id'], "worker-b", {'content': "fresh"}, follow_up)
+    assert queue.get_jobs(run_id, "research")[0]['result'] == {'content': "fresh"}
+    assert len(queue.get_jobs(run_id, "post")) == 1
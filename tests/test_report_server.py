@@ -0,0 +1,97 @@
+"""Range requests, revalidation, path handling and request limits of the report server"""
+
+import asyncio
+
+import pytest
+
+from report_server import MAX_HEADERS, MAX_LINE_SIZE, ReportServer
+
+IMAGE = bytes(range(256)) * 4
+
+
+@pytest.fixture
+def root(tmp_path):
+    (tmp_path / "images").mkdir()
+    (tmp_path / "images" / "post.png").write_bytes(IMAGE)
+    (tmp_path / "reports").mkdir()
+    (tmp_path / "topics.json").write_text('{"secret": true}')
+    return tmp_path
+
+
+def request(root, path, headers=None, raw_head=None):
+    """Send one request to a server on a free port and return (status, headers, body)"""
+    async def exchange():
+        server = await ReportServer(str(root)).start("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        head = raw_head or "".join(f"{name}: {value}\r\n" for name, value in (headers or {}).items())
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n{head}\r\n".encode('latin-1'))
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return response
+
+    response = asyncio.run(exchange())
+    head, _, body = response.partition(b"\r\n\r\n")
+    lines = head.decode('latin-1').split("\r\n")
+    response_headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(':')
+        response_headers[name.strip().lower()] = value.strip()
+    return int(lines[0].split()[1]), response_headers, body
+
+
+def test_parse_range():
+    assert ReportServer.parse_range("bytes=0-99", 1000) == (0, 99)
+    assert ReportServer.parse_range("bytes=900-", 1000) == (900, 999)
+    assert ReportServer.parse_range("bytes=-100", 1000) == (900, 999)
+    assert ReportServer.parse_range("bytes=990-2000", 1000) == (990, 999)
+    assert ReportServer.parse_range("bytes=1000-", 1000) is None
+    assert ReportServer.parse_range("bytes=50-10", 1000) is None
+    assert ReportServer.parse_range("bytes=-0", 1000) is None
+    assert ReportServer.parse_range("bytes=0-1,5-9", 1000) is None
+
+
+def test_range_request_returns_partial_content(root):
+    status, headers, body = request(root, "/images/post.png", {"Range": "bytes=10-19"})
+    assert status == 206
+    assert headers['content-range'] == f"bytes 10-19/{len(IMAGE)}"
+    assert body == IMAGE[10:20]
+
+
+def test_unsatisfiable_range_returns_416(root):
+    status, headers, body = request(root, "/images/post.png", {"Range": f"bytes={len(IMAGE)}-"})
+    assert status == 416
+    assert headers['content-range'] == f"bytes */{len(IMAGE)}"
+    assert body == b""
+
+
+def test_matching_etag_returns_304(root):
+    status, headers, body = request(root, "/images/post.png")
+    assert status == 200 and body == IMAGE
+
+    status, revalidated, body = request(root, "/images/post.png", {"If-None-Match": headers['etag']})
+    assert status == 304
+    assert revalidated['etag'] == headers['etag']
+    assert 'content-length' not in revalidated
+    assert body == b""
+
+
+@pytest.mark.parametrize("path", ["/reports/../topics.json", "/images/%2e%2e/topics.json", "/topics.json"])
+def test_paths_outside_served_directories_are_not_found(root, path):
+    status, _, body = request(root, path)
+    assert status == 404
+    assert b"secret" not in body
+
+
+def test_too_many_headers_are_rejected(root):
+    head = "".join(f"X-Filler-{i}: 1\r\n" for i in range(MAX_HEADERS + 1))
+    status, _, _ = request(root, "/images/post.png", raw_head=head)
+    assert status == 431
+
+
+def test_oversized_header_line_is_rejected(root):
+    status, _, _ = request(root, "/images/post.png", {"X-Filler": "a" * MAX_LINE_SIZE})
+    assert status == 431
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Streaming Topic Sources
+Yields topics lazily from JSONL/text files, stdin or a SQLite table so very large
+topic inventories never have to be loaded into memory. Sampling and sharding are
+applied while streaming, and a bounded read-ahead buffer applies backpressure to
+the source when the pipeline falls behind.
+
+Source specs:
+    topics.jsonl / topics.txt      one topic per line (plain text, a JSON string or {"topic": ...})
+    -                              the same line format read from stdin
+    topics.db#table.column         a column of a SQLite table (default topics.topic)
+"""
+
+import argparse
+import json
+import os
+import queue
+import re
+import sqlite3
+import sys
+import threading
+import zlib
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+from urllib.request import pathname2url
+
+SQLITE_EXTENSIONS = ('.db', '.sqlite', '.sqlite3')
+IDENTIFIER_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def parse_topic_line(line: str) -> Optional[str]:
+    """Return the topic on a JSONL or plain text line, or None for blank lines"""
+    line = line.strip()
+    if not line:
+        return None
+    if line[0] in '{"':
+        try:
+            value = json.loads(line)
+        except json.JSONDecodeError:
+            return line
+        if isinstance(value, dict):
+            value = value.get('topic')
+        return value.strip() if isinstance(value, str) and value.strip() else None
+    return line
+
+
+def iter_line_topics(lines: Iterable[str]) -> Iterator[str]:
+    """Yield topics from an iterable of lines"""
+    for line in lines:
+        topic = parse_topic_line(line)
+        if topic:
+            yield topic
+
+
+def iter_file_topics(path: str) -> Iterator[str]:
+    """Yield topics from a JSONL or text file, one line at a time"""
+    with open(path, 'r', encoding='utf-8') as f:
+        yield from iter_line_topics(f)
+
+
+def iter_sqlite_topics(db_path: str, table: str = "topics", column: str = "topic") -> Iterator[str]:
+    """Yield topics from a SQLite column; the cursor fetches rows as they are consumed"""
+    if not IDENTIFIER_PATTERN.match(table) or not IDENTIFIER_PATTERN.match(column):
+        raise ValueError(f"Invalid SQLite table or column name: {table}.{column}")
+    # Checked up front: sqlite3.connect would silently create an empty database
+    if not os.path.isfile(db_path):
+        raise FileNotFoundError(f"Topic database not found: {db_path}")
+    return read_sqlite_topics(db_path, table, column)
+
+
+def read_sqlite_topics(db_path: str, table: str, column: str) -> Iterator[str]:
+    """Read a validated SQLite topic column without ever writing to the database"""
+    conn = sqlite3.connect(f"file:{pathname2url(os.path.abspath(db_path))}?mode=ro", uri=True)
+    try:
+        cursor = conn.execute(f"SELECT {column} FROM {table} ORDER BY rowid")
+        for (topic,) in cursor:
+            if isinstance(topic, str) and topic.strip():
+                yield topic.strip()
+    finally:
+        conn.close()
+
+
+def open_topic_source(spec: str) -> Iterator[str]:
+    """Open a topic source from its spec"""
+    if spec == '-':
+        return iter_line_topics(sys.stdin)
+
+    path, _, location = spec.partition('#')
+    if path.lower().endswith(SQLITE_EXTENSIONS):
+        table, _, column = location.partition('.')
+        return iter_sqlite_topics(path, table or "topics", column or "topic")
+    return iter_file_topics(path)
+
+
+def parse_shard(shard: str) -> Tuple[int, int]:
+    """Turn "2/8" into (2, 8); shard indexes are zero-based"""
+    try:
+        index, count = (int(part) for part in shard.split('/'))
+    except ValueError:
+        raise ValueError(f"Invalid shard {shard!r}, expected i/n such as 0/4")
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Invalid shard {shard!r}, index must be between 0 and {count - 1}")
+    return index, count
+
+
+def topic_hash(topic: str, salt: str = "") -> int:
+    """Stable hash, so a topic always lands in the same shard and sample"""
+    return zlib.crc32(f"{salt}{topic}".encode('utf-8'))
+
+
+def shard_topics(topics: Iterable[str], index: int, count: int) -> Iterator[str]:
+    """Keep only the topics that belong to one shard"""
+    for topic in topics:
+        if topic_hash(topic) % count == index:
+            yield topic
+
+
+def sample_topics(topics: Iterable[str], rate: float, seed: str = "") -> Iterator[str]:
+    """Keep a deterministic fraction of topics"""
+    threshold = rate * 2 ** 32
+    for topic in topics:
+        if topic_hash(topic, f"{seed}:") < threshold:
+            yield topic
+
+
+def prefetch(topics: Iterable[str], buffer_size: int = 100) -> Iterator[str]:
+    """Read ahead of the pipeline in a background thread, blocking the source when the buffer is full"""
+    buffer = queue.Queue(maxsize=buffer_size)
+    stop = threading.Event()
+    done = object()
+
+    def produce():
+        try:
+            for topic in topics:
+                while not stop.is_set():
+                    try:
+                        buffer.put(topic, timeout=0.5)
+                        break
+                    except queue.Full:
+                        continue
+                if stop.is_set():
+                    return
+            buffer.put(done)
+        except Exception as e:
+            buffer.put(e)
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is done:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        # The consumer stopped early (e.g. the post cap was reached), so release the source
+        stop.set()
+
+
+def stream_topics(topics: Iterable[str], shard: Optional[str] = None, sample_rate: Optional[float] = None,
+                  seed: str = "", limit: Optional[int] = None, buffer_size: int = 100) -> Iterator[str]:
+    """Apply sharding, sampling, a topic limit and read-ahead to a topic stream"""
+    if shard:
+        topics = shard_topics(topics, *parse_shard(shard))
+    if sample_rate is not None and sample_rate < 1:
+        topics = sample_topics(topics, sample_rate, seed)
+    if limit:
+        topics = islice(topics, limit)
+    return prefetch(topics, buffer_size)
+
+
+def add_source_arguments(parser: argparse.ArgumentParser):
+    """Add the topic source options to a command line parser"""
+    parser.add_argument("--topics-source", help="Stream topics from a JSONL/text file, '-' for stdin, or db.sqlite#table.column")
+    parser.add_argument("--shard", help="Only process shard i of n, e.g. 0/4")
+    parser.add_argument("--sample", type=float, help="Only process this fraction of topics, e.g. 0.1")
+    parser.add_argument("--seed", default="", help="Seed for --sample")
+    parser.add_argument("--limit", type=int, help="Stop after this many topics")
+
+
+def topic_stream_from_args(args: argparse.Namespace, config: Dict[str, Any]) -> Optional[Iterator[str]]:
+    """Build a topic stream from command line options and the config's topic_source, or None to use the topic list"""
+    spec = args.topics_source or config.get('topic_source')
+    if spec:
+        topics = open_topic_source(spec)
+    elif args.shard or args.sample is not None or args.limit:
+        topics = iter(config.get('topics', []))
+    else:
+        return None
+    return stream_topics(topics, shard=args.shard, sample_rate=args.sample, seed=args.seed, limit=args.limit)
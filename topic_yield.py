@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Yield-based Topic Prioritization
+Tracks, per topic and across runs, how often research passes the quality filter
+and what it costs in latency and tokens. The scheduler orders topics by expected
+posts per second of research and caps them to what the run budget can afford, so
+calls go to the topics most likely to produce a post.
+
+Usage:
+    python topic_yield.py status [--config topics.json]
+"""
+
+import argparse
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+
+# Rate-limit pause after every research call in the run loop
+RESEARCH_DELAY_SECONDS = 2.0
+
+
+class TopicYieldStore:
+    def __init__(self, db_path: str = "data/topic_yield.db"):
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self.create_tables()
+
+    @contextmanager
+    def connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection that commits on success"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def create_tables(self):
+        """Create the yield schema if it does not exist yet"""
+        with self.connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS topic_yield (
+                    topic TEXT NOT NULL,
+                    content_focus TEXT NOT NULL,
+                    researched INTEGER NOT NULL DEFAULT 0,
+                    passed INTEGER NOT NULL DEFAULT 0,
+                    research_seconds REAL NOT NULL DEFAULT 0,
+                    research_tokens INTEGER NOT NULL DEFAULT 0,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (topic, content_focus)
+                )
+            """)
+
+    def record(self, content_focus: str, results: List[Tuple[str, bool, float, int]]):
+        """Add (topic, passed, research_seconds, research_tokens) outcomes to the totals"""
+        now = time.time()
+        with self.connect() as conn:
+            conn.executemany("""
+                INSERT INTO topic_yield (topic, content_focus, researched, passed, research_seconds, research_tokens, updated_at)
+                VALUES (?, ?, 1, ?, ?, ?, ?)
+                ON CONFLICT (topic, content_focus) DO UPDATE SET
+                    researched = researched + 1,
+                    passed = passed + excluded.passed,
+                    research_seconds = research_seconds + excluded.research_seconds,
+                    research_tokens = research_tokens + excluded.research_tokens,
+                    updated_at = excluded.updated_at
+            """, [(topic, content_focus, int(passed), seconds, tokens, now)
+                  for topic, passed, seconds, tokens in results])
+
+    def get_stats(self, content_focus: str, topics: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Return the totals per topic, for all topics or just the given ones"""
+        with self.connect() as conn:
+            if topics is None:
+                rows = conn.execute("SELECT * FROM topic_yield WHERE content_focus = ?", (content_focus,)).fetchall()
+            else:
+                rows = []
+                # Stay under SQLite's bound parameter limit for large topic lists
+                for start in range(0, len(topics), 500):
+                    chunk = topics[start:start + 500]
+                    placeholders = ",".join("?" for _ in chunk)
+                    rows += conn.execute(
+                        f"SELECT * FROM topic_yield WHERE content_focus = ? AND topic IN ({placeholders})",
+                        (content_focus, *chunk)
+                    ).fetchall()
+        return {row['topic']: dict(row) for row in rows}
+
+
+class TopicScheduler:
+    def __init__(self, store: TopicYieldStore, content_focus: str, min_pass_rate: float = 0.0,
+                 default_seconds: float = 20.0, default_tokens: int = 1500):
+        self.store = store
+        self.content_focus = content_focus
+        self.min_pass_rate = min_pass_rate
+        self.default_seconds = default_seconds
+        self.default_tokens = default_tokens
+
+    def estimate(self, stats: Optional[Dict[str, Any]], default_seconds: Optional[float] = None,
+                 default_tokens: Optional[float] = None) -> Dict[str, float]:
+        """Expected pass rate, research cost and posts per second of research for one topic"""
+        if stats and stats['researched']:
+            # One imaginary pass and one failure keep a single bad run from burying a topic
+            pass_rate = (stats['passed'] + 1) / (stats['researched'] + 2)
+            seconds = stats['research_seconds'] / stats['researched']
+            tokens = stats['research_tokens'] / stats['researched']
+        else:
+            pass_rate = 0.5
+            seconds = default_seconds if default_seconds is not None else self.default_seconds
+            tokens = default_tokens if default_tokens is not None else self.default_tokens
+
+        cost = seconds + RESEARCH_DELAY_SECONDS
+        return {'pass_rate': pass_rate, 'seconds': cost, 'tokens': tokens, 'value': pass_rate / cost}
+
+    def prioritize(self, topics: List[str], time_budget: Optional[float] = None, token_budget: Optional[int] = None,
+                   max_topics: Optional[int] = None) -> Tuple[List[str], List[str]]:
+        """Order topics by expected value and split them into scheduled and deferred topics"""
+        stats = self.store.get_stats(self.content_focus, list(topics))
+        # Topics without history are assumed to cost what the known topics cost on average
+        researched = sum(row['researched'] for row in stats.values())
+        default_seconds = sum(row['research_seconds'] for row in stats.values()) / researched if researched else None
+        default_tokens = sum(row['research_tokens'] for row in stats.values()) / researched if researched else None
+        estimates = {topic: self.estimate(stats.get(topic), default_seconds, default_tokens) for topic in topics}
+        # sorted() is stable, so topics without history keep their configured order among themselves
+        ordered = sorted(topics, key=lambda topic: estimates[topic]['value'], reverse=True)
+
+        scheduled, deferred = [], []
+        spent_seconds = spent_tokens = 0.0
+        for topic in ordered:
+            estimate = estimates[topic]
+            if (estimate['pass_rate'] < self.min_pass_rate
+                    or (max_topics is not None and len(scheduled) >= max_topics)
+                    or (time_budget is not None and spent_seconds + estimate['seconds'] > time_budget)
+                    or (token_budget is not None and spent_tokens + estimate['tokens'] > token_budget)):
+                deferred.append(topic)
+                continue
+            scheduled.append(topic)
+            spent_seconds += estimate['seconds']
+            spent_tokens += estimate['tokens']
+        return scheduled, deferred
+
+    def prioritize_stream(self, topics: Iterable[str], window: int = 100) -> Iterator[str]:
+        """Reorder a topic stream one window at a time, dropping topics below the minimum pass rate"""
+        batch = []
+        for topic in topics:
+            batch.append(topic)
+            if len(batch) >= window:
+                yield from self.prioritize(batch)[0]
+                batch = []
+        if batch:
+            yield from self.prioritize(batch)[0]
+
+
+def main():
+    """Command line entry point for inspecting topic yield"""
+    parser = argparse.ArgumentParser(description="TrendForge topic yield statistics")
+    parser.add_argument("command", choices=["status"])
+    parser.add_argument("--config", default="topics.json", help="Topics configuration file")
+    args = parser.parse_args()
+
+    from content_automation import ContentAutomation
+    automation = ContentAutomation(args.config)
+    scheduler = automation.create_topic_scheduler()
+    stats = scheduler.store.get_stats(automation.content_focus)
+
+    print(f"📈 Topic yield for {automation.content_focus} ({len(stats)} topics with history)")
+    rows = sorted(stats.values(), key=lambda row: scheduler.estimate(row)['value'], reverse=True)
+    for row in rows:
+        estimate = scheduler.estimate(row)
+        print(f"  {row['passed']:>3}/{row['researched']:<3} passed  ~{estimate['pass_rate']:.0%}  "
+              f"{estimate['seconds'] - RESEARCH_DELAY_SECONDS:5.1f}s  {estimate['tokens']:6.0f} tokens  {row['topic']}")
+
+
+if __name__ == "__main__":
+    main()
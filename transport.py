@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Record/Replay Transport for API Calls
+Every research, post and image call goes through a transport. The live transport
+just makes the call; the recording transport also writes the request, response,
+latency and offset into the run to a gzip-compressed JSONL cassette; the replay transport
+serves a cassette back without network access or API keys, optionally with the
+original timing, so real runs can be profiled repeatedly at no cost.
+"""
+
+import gzip
+import hashlib
+import json
+import threading
+import time
+import zlib
+from collections import defaultdict, deque
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+
+
+class ReplayError(requests.exceptions.RequestException):
+    """Base for replay failures
+
+    Subclasses RequestException so research error handling treats a replayed
+    failure exactly like the original one; post and image calls catch Exception.
+    """
+
+
+class ReplayMissError(ReplayError):
+    """The cassette has no response left for a call"""
+
+
+class ReplayedCallError(ReplayError):
+    """A call that failed while recording fails the same way on replay"""
+
+
+def request_key(endpoint: str, request: Any) -> str:
+    """Stable fingerprint of a call, used to find its recorded response"""
+    canonical = json.dumps(request, sort_keys=True, default=str)
+    return hashlib.sha1(f"{endpoint}\n{canonical}".encode('utf-8')).hexdigest()
+
+
+class Transport:
+    """Makes API calls directly"""
+
+    mode = "live"
+    offline = False
+    timing_scale = 1.0
+
+    def call(self, endpoint: str, request: Any, perform: Callable[[], Any],
+             encode: Optional[Callable[[Any], Any]] = None, decode: Optional[Callable[[Any], Any]] = None,
+             match: Any = None) -> Any:
+        """Run perform(); request/encode/decode/match describe the call for recording and replay"""
+        return perform()
+
+    def remember(self, name: str, produce: Callable[[], Any]) -> Any:
+        """Run input such as the topic selection, which a replay reuses instead of asking again"""
+        return produce()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Call counts for reporting"""
+        return {'mode': self.mode}
+
+    def close(self):
+        pass
+
+
+class RecordingTransport(Transport):
+    """Makes API calls and writes each one to a cassette"""
+
+    mode = "record"
+
+    def __init__(self, cassette_file: str):
+        self.cassette_file = cassette_file
+        self.cassette = gzip.open(cassette_file, 'wt', encoding='utf-8')
+        self.started = time.monotonic()
+        self.lock = threading.Lock()
+        self.recorded = defaultdict(int)
+
+    def call(self, endpoint, request, perform, encode=None, decode=None, match=None):
+        entry = {
+            'endpoint': endpoint,
+            'key': request_key(endpoint, request if match is None else match),
+            'request': request,
+            'offset': round(time.monotonic() - self.started, 3)
+        }
+        started = time.monotonic()
+        try:
+            result = perform()
+        except Exception as e:
+            entry['latency'] = round(time.monotonic() - started, 3)
+            entry['error'] = {'type': type(e).__name__, 'message': str(e)}
+            self.write(entry)
+            raise
+
+        entry['latency'] = round(time.monotonic() - started, 3)
+        entry['response'] = encode(result) if encode else result
+        self.write(entry)
+        return result
+
+    def remember(self, name, produce):
+        started = time.monotonic()
+        value = produce()
+        # Not an API call, so it carries no latency, and offsets leave out the time taken
+        # (an interactive selection would otherwise replay the user's typing time)
+        self.started += time.monotonic() - started
+        self.write({'endpoint': name, 'key': request_key(name, {}), 'request': {},
+                    'offset': round(time.monotonic() - self.started, 3), 'latency': 0.0, 'response': value})
+        return value
+
+    def write(self, entry: Dict[str, Any]):
+        """Append one call to the cassette, flushed so a crashed run keeps what it recorded"""
+        with self.lock:
+            self.cassette.write(json.dumps(entry, default=str) + "\n")
+            self.cassette.flush()
+            self.recorded[entry['endpoint']] += 1
+
+    def get_stats(self):
+        return {'mode': self.mode, 'cassette': self.cassette_file, 'recorded': dict(self.recorded)}
+
+    def close(self):
+        with self.lock:
+            if not self.cassette.closed:
+                self.cassette.close()
+
+
+class ReplayTransport(Transport):
+    """Serves recorded responses instead of making API calls"""
+
+    mode = "replay"
+    offline = True
+
+    def __init__(self, cassette_file: str, timing_scale: float = 0.0):
+        self.cassette_file = cassette_file
+        self.timing_scale = timing_scale
+        self.started = time.monotonic()
+        self.lock = threading.Lock()
+        self.by_key = defaultdict(deque)
+        self.by_endpoint = defaultdict(deque)
+        self.stats = {'exact': 0, 'sequential': 0, 'missed': 0}
+
+        for entry in self.load(cassette_file):
+            entry['used'] = False
+            self.by_key[(entry['endpoint'], entry['key'])].append(entry)
+            self.by_endpoint[entry['endpoint']].append(entry)
+
+    @staticmethod
+    def load(cassette_file: str) -> List[Dict[str, Any]]:
+        """Read a cassette, keeping every complete entry of a cassette cut short by a crash"""
+        entries = []
+        with gzip.open(cassette_file, 'rt', encoding='utf-8') as f:
+            try:
+                for line in f:
+                    if line.strip():
+                        entries.append(json.loads(line))
+            except (EOFError, zlib.error, json.JSONDecodeError):
+                print(f"⚠️ Cassette {cassette_file} is truncated; replaying the {len(entries)} complete calls")
+        return entries
+
+    def next_entry(self, endpoint: str, key: str) -> Optional[Dict[str, Any]]:
+        """Take the recorded call with the same request, or else the next unused call to the endpoint"""
+        with self.lock:
+            exact = self.by_key.get((endpoint, key))
+            while exact:
+                entry = exact.popleft()
+                if not entry['used']:
+                    entry['used'] = True
+                    self.stats['exact'] += 1
+                    return entry
+
+            # Prompts that embed dates or random styles never match exactly, so fall back to call order
+            pending = self.by_endpoint.get(endpoint)
+            while pending:
+                entry = pending.popleft()
+                if not entry['used']:
+                    entry['used'] = True
+                    self.stats['sequential'] += 1
+                    return entry
+
+            self.stats['missed'] += 1
+            return None
+
+    def call(self, endpoint, request, perform, encode=None, decode=None, match=None):
+        entry = self.next_entry(endpoint, request_key(endpoint, request if match is None else match))
+        if entry is None:
+            raise ReplayMissError(f"No recorded {endpoint} call left in {self.cassette_file}")
+
+        if self.timing_scale:
+            # Finish when the recorded call finished, so rate-limit waits and overlapping calls replay as recorded
+            due = self.started + (entry['offset'] + entry['latency']) * self.timing_scale
+            time.sleep(max(0.0, due - time.monotonic()))
+        if entry.get('error'):
+            raise ReplayedCallError(f"{entry['error']['type']}: {entry['error']['message']}")
+        return decode(entry['response']) if decode else entry['response']
+
+    def remember(self, name, produce):
+        entry = self.next_entry(name, request_key(name, {}))
+        if entry is None:
+            raise ReplayMissError(f"No recorded {name} in {self.cassette_file}")
+        return entry['response']
+
+    def get_stats(self):
+        return {'mode': self.mode, 'cassette': self.cassette_file, **self.stats}
+
+
+def create_transport(record: Optional[str] = None, replay: Optional[str] = None,
+                     timing_scale: float = 0.0) -> Transport:
+    """Create the transport for a run from the --record/--replay options"""
+    if record and replay:
+        raise ValueError("Choose either --record or --replay, not both")
+    if record:
+        return RecordingTransport(record)
+    if replay:
+        return ReplayTransport(replay, timing_scale)
+    return Transport()
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Distributed Worker Mode for Content Automation
+The coordinator expands the topic config into research, post and image jobs in a
+shared job queue; any number of workers on one or more hosts process them.
+
+Usage:
+    python worker_mode.py coordinator [--queue data/job_queue.db] [--local-workers 4]
+    python worker_mode.py worker [--queue data/job_queue.db]
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from typing import List, Dict, Any, Optional, Iterable
+
+from content_automation import ContentAutomation
+from job_queue import JobQueue
+from run_budget import RunBudget
+from topic_sources import add_source_arguments, topic_stream_from_args
+
+RESEARCH_JOB = "research"
+POST_JOB = "post"
+IMAGE_JOB = "image"
+
+
+class QueueWorker:
+    def __init__(self, queue: JobQueue, lease_seconds: float = 600, poll_interval: float = 2.0,
+                 worker_id: Optional[str] = None):
+        self.queue = queue
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.automations = {}  # One ContentAutomation per config file
+
+    def get_automation(self, run: Dict[str, Any]) -> ContentAutomation:
+        """Return an automation for the run's config, bound to the run's deadline"""
+        config_file = run['config_file']
+        if config_file not in self.automations:
+            self.automations[config_file] = ContentAutomation(config_file)
+        automation = self.automations[config_file]
+
+        # Every worker shares the deadline the coordinator set for the run
+        remaining = max(0.0, run['deadline_at'] - time.time()) if run['deadline_at'] else None
+        automation.budget = RunBudget(remaining, automation.run_settings.get('request_timeout_seconds', 120))
+        return automation
+
+    def process_job(self, job: Dict[str, Any]):
+        """Run a single claimed job and store its result"""
+        automation = self.get_automation(self.queue.get_run(job['run_id']))
+        # The automation outlives the job, so each job starts with an empty skip list
+        automation.skipped_topics = []
+        follow_up = None
+
+        if job['kind'] == RESEARCH_JOB:
+            result = automation.scrape_latest_trends(job['topic'])
+        elif job['kind'] == POST_JOB:
+            result = automation.generate_linkedin_post(job['payload']['trend_data'])
+            if not result.get('skipped'):
+                follow_up = [(IMAGE_JOB, job['position'], job['topic'], {'post_data': result})]
+        elif job['kind'] == IMAGE_JOB:
+            post_data = job['payload']['post_data']
+            image_path = automation.generate_post_image(post_data)
+            result = {
+                'image_path': image_path,
+                'image_source': post_data.get('image_source', ''),
+                'image_tier': post_data.get('image_tier', ''),
+                'image_rerender_queued': post_data.get('image_rerender_queued', False),
+                'image_seconds': post_data.get('timings', {}).get('image')
+            }
+        else:
+            raise ValueError(f"Unknown job kind: {job['kind']}")
+
+        result['skipped_steps'] = automation.skipped_topics
+        automation.skipped_topics = []
+        if not self.queue.complete(job['job_id'], self.worker_id, result, follow_up):
+            print(f"⚠️ Lease lost for {job['kind']} job {job['job_id']}; result discarded")
+
+    def run(self, max_jobs: Optional[int] = None):
+        """Claim and process jobs until max_jobs is reached (or forever)"""
+        print(f"👷 Worker {self.worker_id} polling {self.queue.db_path}")
+        processed = 0
+
+        while max_jobs is None or processed < max_jobs:
+            job = self.queue.claim(self.worker_id, self.lease_seconds)
+            if job is None:
+                time.sleep(self.poll_interval)
+                continue
+
+            print(f"\n[{self.worker_id}] {job['kind']} job {job['job_id']}: {job['topic']} (attempt {job['attempts']})")
+
+            # Keep the lease alive while slow API calls are in flight
+            stop_heartbeat = threading.Event()
+            heartbeat = threading.Thread(target=self._heartbeat, args=(job['job_id'], stop_heartbeat), daemon=True)
+            heartbeat.start()
+            try:
+                self.process_job(job)
+            except Exception as e:
+                print(f"❌ {job['kind']} job {job['job_id']} failed: {e}")
+                self.queue.fail(job['job_id'], self.worker_id, str(e))
+            finally:
+                stop_heartbeat.set()
+                heartbeat.join()
+
+            processed += 1
+
+    def _heartbeat(self, job_id: int, stop: threading.Event):
+        while not stop.wait(self.lease_seconds / 3):
+            if not self.queue.extend_lease(job_id, self.worker_id, self.lease_seconds):
+                return
+
+
+class Coordinator:
+    def __init__(self, queue: JobQueue, config_file: str = "topics.json", poll_interval: float = 5.0):
+        self.queue = queue
+        self.config_file = config_file
+        self.poll_interval = poll_interval
+        self.automation = ContentAutomation(config_file)
+
+    def submit(self, topics: Optional[Iterable[str]] = None, deadline_minutes: Optional[float] = None) -> str:
+        """Create a run and enqueue one research job per topic, reading streamed topics lazily"""
+        if topics is None:
+            topics = self.automation.config['topics']
+        if deadline_minutes is None:
+            deadline_minutes = self.automation.run_settings.get('deadline_minutes')
+
+        run_id = self.queue.create_run(self.config_file, deadline_minutes)
+        self.automation.budget = self.automation.create_budget(deadline_minutes)
+        self.automation.skipped_topics = []
+        self.automation.skipped_overflow = 0
+        if self.automation.topic_scheduler and self.automation.priority_settings.get('enabled', False):
+            # Workers run in parallel, so only the order and explicit caps apply, not the deadline share
+            if isinstance(topics, list):
+                topics = self.automation.prioritize_topics(topics, use_deadline=False)
+            else:
+                topics = self.automation.topic_scheduler.prioritize_stream(
+                    topics, self.automation.priority_settings.get('window', 100))
+        queued = self.queue.enqueue_many(
+            run_id, ((RESEARCH_JOB, position, topic, {}) for position, topic in enumerate(topics)))
+
+        print(f"📥 Run {run_id}: queued {queued} research jobs")
+        return run_id
+
+    def wait_for(self, run_id: str, kind: Optional[str] = None) -> Dict[str, int]:
+        """Block until no pending or leased jobs remain"""
+        while True:
+            counts = self.queue.get_counts(run_id, kind)
+            if counts[JobQueue.PENDING] + counts[JobQueue.LEASED] == 0:
+                return counts
+            print(f"⏳ {kind or 'all'} jobs: {counts[JobQueue.DONE]} done, {counts[JobQueue.LEASED]} running, "
+                  f"{counts[JobQueue.PENDING]} pending, {counts[JobQueue.FAILED]} failed")
+            time.sleep(self.poll_interval)
+
+    def run(self, topics: Optional[Iterable[str]] = None, deadline_minutes: Optional[float] = None) -> str:
+        """Drive a full run through the queue and return the report path"""
+        run_id = self.submit(topics, deadline_minutes)
+
+        print("\n" + "="*50)
+        print("STEP 1: SCRAPING LATEST TRENDS (distributed)")
+        print("="*50)
+        self.wait_for(run_id, RESEARCH_JOB)
+
+        selected_topics = self.select_topics(run_id)
+
+        print("\n" + "="*50)
+        print("STEP 2: GENERATING LINKEDIN POSTS (distributed)")
+        print("="*50)
+        self.queue.enqueue_many(run_id, ((POST_JOB, position, trend_data['topic'], {'trend_data': trend_data})
+                                         for position, trend_data in enumerate(selected_topics)))
+        self.wait_for(run_id)
+
+        return self.assemble_report(run_id)
+
+    def select_topics(self, run_id: str, chunk_size: int = 500) -> List[Dict[str, Any]]:
+        """Pick the research results to write posts for, reading the queue one chunk at a time"""
+        automation = self.automation
+        max_posts = automation.run_settings.get('max_posts', 8)
+        fresh, downgraded = [], []
+        chunk = []
+
+        def select_chunk():
+            # Each chunk keeps at most max_posts candidates, so memory stays flat however many topics ran
+            for trend_data in automation.select_quality_topics(chunk):
+                if trend_data.get('coverage', {}).get('decision') == 'downgrade':
+                    downgraded.append(trend_data)
+                else:
+                    fresh.append(trend_data)
+            del fresh[max_posts:], downgraded[max_posts:]
+            automation.compact_skipped_topics()
+
+        for job in self.queue.iter_jobs(run_id, RESEARCH_JOB):
+            if job['result']:
+                chunk.append(job['result'])
+            if len(chunk) >= chunk_size:
+                select_chunk()
+                chunk = []
+        if chunk:
+            select_chunk()
+
+        # Partly covered stories only get the slots no fresh story needs
+        return (fresh + downgraded)[:max_posts]
+
+    def assemble_report(self, run_id: str) -> str:
+        """Collect job results into the automation and write the HTML report"""
+        automation = self.automation
+        # Post and image jobs are capped at max_posts; research jobs are streamed from the queue
+        post_jobs = self.queue.get_jobs(run_id, POST_JOB)
+        image_jobs = self.queue.get_jobs(run_id, IMAGE_JOB)
+
+        automation.topics = [job['topic'] for job in post_jobs]
+        automation.topic_count = 0
+        automation.scraped_data = []
+        automation.generated_posts = []
+        automation.usage_totals = {}
+
+        def collect(job: Dict[str, Any]):
+            if job['status'] == JobQueue.FAILED:
+                automation.skipped_topics.append({
+                    'topic': job['topic'],
+                    'stage': job['kind'],
+                    'reason': f"job failed after {job['attempts']} attempts: {job['error']}"
+                })
+            elif job['result']:
+                automation.skipped_topics.extend(job['result'].get('skipped_steps', []))
+                if job['result'].get('usage'):
+                    provider = 'perplexity' if job['kind'] == RESEARCH_JOB else 'openai_chat'
+                    automation.record_usage(provider, job['result']['usage'])
+            automation.compact_skipped_topics()
+
+        for job in self.queue.iter_jobs(run_id, RESEARCH_JOB):
+            automation.topic_count += 1
+            collect(job)
+        for job in post_jobs + image_jobs:
+            collect(job)
+
+        image_results = {job['position']: job['result'] for job in image_jobs if job['result']}
+        for job in post_jobs:
+            post_data = job['result']
+            if not post_data or post_data.get('skipped'):
+                continue
+            image_result = image_results.get(job['position'], {})
+            post_data['image_path'] = image_result.get('image_path', "")
+            post_data['image_source'] = image_result.get('image_source', "")
+            post_data['image_tier'] = image_result.get('image_tier', "")
+            post_data['image_rerender_queued'] = image_result.get('image_rerender_queued', False)
+            if image_result.get('image_seconds') is not None:
+                post_data.setdefault('timings', {})['image'] = image_result['image_seconds']
+            automation.generated_posts.append(post_data)
+            automation.record_coverage(post_data)
+
+        automation.report_stem = None
+        report_file = automation.save_to_html()
+        export_file = automation.save_to_jsonl()
+        print(f"\n✅ Run {run_id}: {len(automation.generated_posts)} posts assembled")
+        print(f"📄 Results saved to: {report_file}")
+        if export_file:
+            print(f"📦 Bulk export saved to: {export_file}")
+        automation.refill_image_pool()
+        return report_file
+
+
+def start_local_workers(count: int, queue_path: str) -> List[subprocess.Popen]:
+    """Spawn worker processes on this host"""
+    return [
+        subprocess.Popen([sys.executable, os.path.abspath(__file__), "worker", "--queue", queue_path])
+        for _ in range(count)
+    ]
+
+
+def main():
+    """Command line entry point for coordinator and worker processes"""
+    parser = argparse.ArgumentParser(description="TrendForge distributed worker mode")
+    subparsers = parser.add_subparsers(dest="role", required=True)
+
+    coordinator_parser = subparsers.add_parser("coordinator", help="Queue a run and assemble its report")
+    coordinator_parser.add_argument("--queue", default="data/job_queue.db", help="Path to the shared job queue")
+    coordinator_parser.add_argument("--config", default="topics.json", help="Topics configuration file")
+    coordinator_parser.add_argument("--deadline-minutes", type=float, help="Override run_settings.deadline_minutes")
+    coordinator_parser.add_argument("--local-workers", type=int, default=0, help="Worker processes to start on this host")
+    add_source_arguments(coordinator_parser)
+
+    worker_parser = subparsers.add_parser("worker", help="Process jobs from the queue")
+    worker_parser.add_argument("--queue", default="data/job_queue.db", help="Path to the shared job queue")
+    worker_parser.add_argument("--lease-seconds", type=float, default=600, help="Lease length before a job is reclaimed")
+    worker_parser.add_argument("--max-jobs", type=int, help="Exit after processing this many jobs")
+
+    args = parser.parse_args()
+    queue = JobQueue(args.queue)
+
+    if args.role == "worker":
+        QueueWorker(queue, lease_seconds=args.lease_seconds).run(args.max_jobs)
+        return
+
+    workers = start_local_workers(args.local_workers, args.queue)
+    try:
+        coordinator = Coordinator(queue, args.config)
+        coordinator.run(topic_stream_from_args(args, coordinator.automation.config), args.deadline_minutes)
+    finally:
+        for worker in workers:
+            worker.terminate()
+
+
+if __name__ == "__main__":
+    main()